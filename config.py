@@ -1,53 +1,89 @@
 import os
-from typing import Dict, Any
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Any
 
+
+# Default of every environment-backed field: resolved from one environment snapshot after __init__
+_FROM_ENV = object()
+
+
+def _env(name: str, default: str, cast: Callable[[str], Any] = str):
+    """Dataclass field read from the environment unless passed to the constructor"""
+    return field(default=_FROM_ENV, metadata={'env': name, 'default': default, 'cast': cast})
+
+
+def _read_env(f, env: Mapping[str, str]) -> Any:
+    """Value of an environment-backed field from an environment mapping"""
+    return f.metadata['cast'](env.get(f.metadata['env'], f.metadata['default']))
+
+
+@dataclass(frozen=True, slots=True)
 class ScraperConfig:
     """Configuration management for the scraper"""
-    
-    def __init__(self):
-        # Auto-save settings
-        self.AUTO_SAVE_INTERVAL = int(os.getenv('AUTO_SAVE_INTERVAL', '1000'))
-        self.REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1.0'))
-        
-        # File settings
-        self.INPUT_FILE = os.getenv('INPUT_FILE', '/app/input/urls.xlsx')
-        self.URL_COLUMN = os.getenv('URL_COLUMN', 'url')
-        self.START_FROM = int(os.getenv('START_FROM', '0'))
-        
-        # Network settings
-        self.TIMEOUT = int(os.getenv('TIMEOUT', '30'))
-        self.MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
-        self.USER_AGENT = os.getenv('USER_AGENT', 
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
-        # Output settings
-        self.OUTPUT_DIR = os.getenv('OUTPUT_DIR', '/app/output')
-        self.LOG_DIR = os.getenv('LOG_DIR', '/app/logs')
-        
-        # Performance settings
-        self.MAX_WORKERS = int(os.getenv('MAX_WORKERS', '1'))
-        self.MEMORY_LIMIT = os.getenv('MEMORY_LIMIT', '2g')
-    
-    def get_dict(self) -> Dict[str, Any]:
-        """Return configuration as dictionary"""
-        return {
-            'AUTO_SAVE_INTERVAL': self.AUTO_SAVE_INTERVAL,
-            'REQUEST_DELAY': self.REQUEST_DELAY,
-            'INPUT_FILE': self.INPUT_FILE,
-            'URL_COLUMN': self.URL_COLUMN,
-            'START_FROM': self.START_FROM,
-            'TIMEOUT': self.TIMEOUT,
-            'MAX_RETRIES': self.MAX_RETRIES,
-            'USER_AGENT': self.USER_AGENT,
-            'OUTPUT_DIR': self.OUTPUT_DIR,
-            'LOG_DIR': self.LOG_DIR,
-            'MAX_WORKERS': self.MAX_WORKERS,
-            'MEMORY_LIMIT': self.MEMORY_LIMIT
-        }
-    
+
+    # Auto-save settings
+    AUTO_SAVE_INTERVAL: int = _env('AUTO_SAVE_INTERVAL', '1000', int)
+    REQUEST_DELAY: float = _env('REQUEST_DELAY', '1.0', float)
+
+    # File settings
+    INPUT_FILE: str = _env('INPUT_FILE', '/app/input/urls.xlsx')
+    URL_COLUMN: str = _env('URL_COLUMN', 'url')
+    START_FROM: int = _env('START_FROM', '0', int)
+
+    # Network settings
+    TIMEOUT: int = _env('TIMEOUT', '30', int)
+    MAX_RETRIES: int = _env('MAX_RETRIES', '3', int)
+    USER_AGENT: str = _env('USER_AGENT',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+    # Output settings
+    OUTPUT_DIR: str = _env('OUTPUT_DIR', '/app/output')
+    LOG_DIR: str = _env('LOG_DIR', '/app/logs')
+
+    # Performance settings
+    MAX_WORKERS: int = _env('MAX_WORKERS', '16', int)
+    MEMORY_LIMIT: str = _env('MEMORY_LIMIT', '2g')
+
+    def __post_init__(self):
+        # Settings not given to the constructor come from the environment
+        env = None
+        for f in fields(self):
+            if getattr(self, f.name) is _FROM_ENV:
+                if env is None:
+                    # Snapshot the environment once instead of going through os.environ per field
+                    env = dict(os.environ)
+                object.__setattr__(self, f.name, _read_env(f, env))
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = None) -> 'ScraperConfig':
+        """Build the configuration from an environment mapping (default: the process environment)"""
+        if env is None:
+            return cls()
+        return cls(**{f.name: _read_env(f, env) for f in fields(cls)})
+
+    def get_dict(self) -> Mapping[str, Any]:
+        """Return configuration as a read-only mapping"""
+        return MappingProxyType(_config_dict(self))
+
     def print_config(self):
         """Print current configuration"""
-        print("=== SCRAPER CONFIGURATION ===")
-        for key, value in self.get_dict().items():
-            print(f"{key}: {value}")
-        print("=" * 30)
+        lines = ["=== SCRAPER CONFIGURATION ==="]
+        lines.extend(f"{key}: {value}" for key, value in self.get_dict().items())
+        lines.append("=" * 30)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+@lru_cache(maxsize=None)
+def _config_dict(config: ScraperConfig) -> Dict[str, Any]:
+    """Build a config's dict once; the config is immutable and hashable, so it is its own cache key.
+    Kept outside the instance so the config itself stays picklable and asdict()-able"""
+    return {f.name: getattr(config, f.name) for f in fields(config)}
+
+
+@lru_cache(maxsize=1)
+def get_config() -> ScraperConfig:
+    """Return the process-wide configuration, parsed from the environment once"""
+    return ScraperConfig()
@@ -1,41 +1,459 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 import re
-from bs4 import BeautifulSoup
-from typing import Dict, Any, List
+import lxml.html
+from lxml import etree
+from typing import Dict, Any, List, Iterator, Optional, Tuple
 import time
+import random
 import pandas as pd
+import openpyxl
+import xlsxwriter
+from itertools import chain, islice
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 import os
-import json
+import orjson
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 import signal
 import sys
+from urllib.parse import urlparse
+
+
+# Raw response bodies are decoded as UTF-8 by libxml2 itself (its own default would be Latin-1)
+# Pages are parsed in the fetch threads, so each thread gets its own parser instance
+_parsers = threading.local()
+
+
+def _utf8_parser() -> lxml.html.HTMLParser:
+    """This thread's parser, created on first use"""
+    parser = getattr(_parsers, 'utf8', None)
+    if parser is None:
+        parser = _parsers.utf8 = lxml.html.HTMLParser(encoding='utf-8')
+    return parser
+
+
+def _parse_html(html):
+    """Parse a page (str or raw UTF-8 bytes) into an lxml document tree (C parser, no BeautifulSoup wrapper)"""
+    try:
+        if isinstance(html, bytes):
+            return lxml.html.document_fromstring(html, parser=_utf8_parser())
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=_utf8_parser())
+    except etree.ParserError:
+        # Empty or whitespace-only document
+        return lxml.html.document_fromstring('<html></html>')
+
+
+_JSON_START_RE = re.compile(r'\s*\{')
+_JSON_START_BYTES_RE = re.compile(rb'\s*\{')
+
+
+def _is_json(html) -> bool:
+    """Coach profiles are sometimes served as a JSON object instead of a page"""
+    pattern = _JSON_START_BYTES_RE if isinstance(html, bytes) else _JSON_START_RE
+    return pattern.match(html) is not None
+
+
+def _element_text(element) -> str:
+    """Text content of an element, stripped per text node like BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+def _element_value(element) -> str:
+    """Value attribute of an element, falling back to its text content"""
+    return element.get('value') or _element_text(element)
+
+
+def _id_xpath(id_fields: Dict[str, str]) -> etree.XPath:
+    """Compile a single XPath that selects every element carrying one of the given ids"""
+    return etree.XPath('//*[' + ' or '.join(f"@id='{field_id}'" for field_id in id_fields) + ']')
+
+
+def _find_ids(tree, id_xpath: etree.XPath) -> Dict[str, Any]:
+    """Map each matched id to its first element, using one tree traversal"""
+    found = {}
+    for element in id_xpath(tree):
+        found.setdefault(element.get('id'), element)
+    return found
+
+
+# Element id -> output field, per content type
+_VENUE_ID_FIELDS = {
+    'academy_phone': 'phone',
+    'academy_address': 'address',
+    'listing_title': 'name',
+    'loc_id_details': 'location_id',
+    'sport_details': 'sport',
+    'object_type_details': 'object_type',
+    'academy_phone2': 'phone2'
+}
+_COACH_ID_FIELDS = {
+    'coachName': 'name',
+    'coachPhone': 'phone',
+    'coachAddress': 'address',
+    'sport_details': 'sport'
+}
+_PLAYER_ID_FIELDS = {
+    'playerAddress': 'address',
+    'playerPhone': 'phone',
+    'playerName': 'name',
+    'loc_id_details': 'location_id',
+    'object_id_details': 'object_id'
+}
+
+# Coach JSON key -> output field
+_COACH_JSON_FIELDS = {
+    'name': 'name',
+    'phone': 'phone',
+    'email': 'email',
+    'address': 'address',
+    'city': 'city',
+    'state': 'state',
+    'sport': 'sport',
+    'experience': 'experience',
+    'education': 'education',
+    'achievement': 'achievement',
+    'skill': 'skills',
+    'heighlight': 'highlight',
+    'fee': 'fee',
+    'package': 'package',
+    'gender': 'gender',
+    'location': 'location',
+    'certificate': 'certificate',
+    'about': 'about',
+    'postcode': 'postcode',
+    'lat': 'latitude',
+    'lng': 'longitude'
+}
+
+_VENUE_ID_XPATH = _id_xpath(_VENUE_ID_FIELDS)
+_COACH_ID_XPATH = _id_xpath(_COACH_ID_FIELDS)
+_PLAYER_ID_XPATH = _id_xpath(_PLAYER_ID_FIELDS)
+
+
+def _alternatives(*patterns: str) -> Tuple[re.Pattern, ...]:
+    """Compile alternative patterns (one capture group each), case-insensitive, in priority order"""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
+def _first_matches(patterns: Tuple[re.Pattern, ...], html: str) -> Iterator[str]:
+    """Capture of the first hit of every alternative, in priority order"""
+    # Each alternative scans on its own: a fused alternation would let an earlier, lower
+    # priority match swallow the span holding a higher priority one
+    for pattern in patterns:
+        match = pattern.search(html)
+        if match:
+            yield match.group(1)
+
+
+def _icon_xpath(icon_class: str) -> etree.XPath:
+    """Compile an XPath for an empty Font Awesome <i> icon with exactly this class"""
+    return etree.XPath(f"//i[@class='{icon_class}'][not(node())]")
+
+
+def _icon_texts(tree, icon_xpath: etree.XPath) -> List[str]:
+    """Text following the first matching icon: its first line, then the whole run up to the next tag"""
+    for icon in icon_xpath(tree):
+        text = (icon.tail or '').lstrip()
+        if not text:
+            return []
+        return [text.split('\n', 1)[0], text]
+    return []
+
+
+def _candidates(tree, icon_xpath: etree.XPath, patterns: Tuple[re.Pattern, ...], html: str):
+    """Icon text from the tree first; the raw-HTML regex scan only runs if those are rejected"""
+    yield from _icon_texts(tree, icon_xpath)
+    yield from _first_matches(patterns, html)
+
+
+# Icons that label contact details on coach/player pages
+_LOCATION_ICON_XPATH = _icon_xpath('fa-solid fa-location-dot')
+_EMAIL_ICON_XPATH = _icon_xpath('fa-regular fa-envelope')
+_PHONE_ICON_XPATH = _icon_xpath('fa-solid fa-phone')
+
+
+# Precompiled patterns for the regex-based fallbacks
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
+_INSTAGRAM_RE = re.compile(r'<a href="(https://www\.instagram\.com/[^"]+)"')
+
+_LOCATION_PATTERNS = _alternatives(
+    r'Location[:\s]*([^<\n]+)',
+    r'Address[:\s]*([^<\n]+)'
+)
+_EMAIL_PATTERNS = _alternatives(
+    r'Email[:\s]*([^<\n]+@[^<\n]+)',
+    r'Contact[:\s]*([^<\n]+@[^<\n]+)',
+    r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+)
+_PHONE_PATTERNS = _alternatives(
+    r'Phone[:\s]*([^<\n]+)',
+    r'Contact[:\s]*([^<\n]+)',
+    r'(\+?[0-9\s\-\(\)]{10,})'
+)
+_DOB_PATTERNS = _alternatives(
+    r'Date Of Birth[:\s]*(\d{4}-\d{2}-\d{2})',
+    r'DOB[:\s]*(\d{4}-\d{2}-\d{2})',
+    r'Born[:\s]*(\d{4}-\d{2}-\d{2})'
+)
+
+
+def _url_alternation(*substrings: str) -> re.Pattern:
+    """Compile case-insensitive substring tests into one regex, so a URL is scanned once per rule"""
+    return re.compile('|'.join(re.escape(substring) for substring in substrings), re.IGNORECASE)
+
+
+# URL path substring -> content type, checked in order
+_URL_TYPE_RULES = (
+    # Listing pages, by the type they list
+    (_url_alternation('-coaches-in-', 'clid-'), 'coach'),
+    (_url_alternation('-players-in-', 'pid-'), 'player'),
+    (_url_alternation('-gyms-in-', '-academies-in-', 'aid-'), 'venue'),
+    # Individual profile patterns
+    (_url_alternation('/gym/', '/academy', 'academy', '/school', 'school',
+                      '/club', 'club', '/fc', 'fc', '/acad', 'acad',
+                      '-aid-', '/aid-', 'football-accademy', 'football-academy'), 'venue'),
+    (_url_alternation('coach', '-chid-'), 'coach'),
+    (_url_alternation('player', '-pid-'), 'player'),
+)
+
+# Explicit profile id markers in the URL path; only these are trusted without scoring
+_PROFILE_ID_RULES = (
+    (_url_alternation('-aid-'), 'venue'),
+    (_url_alternation('-chid-'), 'coach'),
+    (_url_alternation('-pid-'), 'player'),
+)
+
+# Error recorded when a page could not be fetched even after retries
+_FETCH_FAILED = 'Failed to fetch page'
+
+# Result types that count as a successful extraction
+_PROFILE_TYPES = frozenset(('venue', 'coach', 'player'))
+
+
+def _class_contains(tag: str, word: str) -> str:
+    """XPath test for a <tag> whose class attribute contains word, case-insensitively"""
+    return f"//{tag}[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{word}')]"
+
+
+# Structural hints that a page lists many profiles rather than showing one
+_LISTING_INDICATOR_XPATHS = [
+    etree.XPath(f'boolean({expression})') for expression in (
+        # Multiple profile cards or listings
+        _class_contains('div', 'card'),
+        _class_contains('div', 'listing'),
+        _class_contains('div', 'profile'),
+        # Search/filter elements
+        "//input[@type='search']",
+        "//select[contains(translate(@name, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'filter')]",
+        # Pagination
+        "//nav[@aria-label='pagination']",
+        _class_contains('ul', 'pagination'),
+    )
+]
+# Visible text only, like BeautifulSoup's get_text() (script/style contents excluded)
+_VISIBLE_TEXT_XPATH = etree.XPath('//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]')
+
+
+# Responses worth downloading, and a cap on how large a profile page can plausibly be
+_FETCHED_CONTENT_TYPES = ('html', 'json', 'text/plain')
+_MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class _SkippedPage(Exception):
+    """A response that can never hold a profile; unlike a failed fetch it is not worth retrying"""
+
+
+class _PermanentFetchError(Exception):
+    """A 4xx response other than 429; a later run would get the same answer, so it is not retried"""
+
+
+# Rotated per request so consecutive fetches don't share one browser fingerprint
+_USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14.4; rv:125.0) Gecko/20100101 Firefox/125.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 13; SM-S911B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+]
+_ACCEPT_LANGUAGES = [
+    'en-US,en;q=0.9',
+    'en-GB,en;q=0.9',
+    'en-IN,en;q=0.9,hi;q=0.8',
+    'en-US,en;q=0.8',
+    'en;q=0.9'
+]
+
+
+# Result type -> Excel sheet; each type is also streamed to output/<sheet>.ndjson
+_SHEETS = {
+    'venue': 'Venues',
+    'coach': 'Coaches',
+    'player': 'Players',
+    'error': 'Errors'
+}
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write a file so that a crash leaves either the old version or the new one, never half of it"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # Persist the rename itself
+    dir_fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class HostThrottle:
+    """Adaptive politeness state for one host: a token bucket refilled every min_delay (with jitter)
+    that backs off when rate limited"""
+    
+    def __init__(self, base_delay: float, max_concurrent: int, max_delay: float = 60.0, burst: int = 2):
+        self.base_delay = base_delay
+        self.min_delay = base_delay
+        self.max_delay = max_delay
+        # Requests that may start back to back after the host has been idle; the long-run rate
+        # stays one per min_delay. Kept small and independent of the worker count, so a wide pool
+        # never fires a volley at one host
+        self.burst = max(1, burst)
+        self.last_request = 0.0
+        self.paused_until = 0.0
+        self.rate_limit_count = 0
+        self.slots = threading.Semaphore(max_concurrent)
+        self.lock = threading.Lock()
+    
+    def time_until_next(self) -> float:
+        """Take a token and return how long the caller must wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.min_delay + random.uniform(0, 0.5 * self.min_delay)
+            # last_request is the theoretical time of the latest token; unused credit from an
+            # idle period is capped at burst tokens
+            due = max(self.last_request + delay, now - (self.burst - 1) * self.min_delay)
+            start = max(now, due, self.paused_until)
+            self.last_request = max(due, self.paused_until)
+            return start - now
+    
+    def record_success(self):
+        """Ease the delay back towards the configured base after a good response"""
+        with self.lock:
+            self.min_delay = max(self.base_delay, self.min_delay * 0.9)
+    
+    def signal_rate_limit(self, pause: float = None):
+        """Slow down after a 429/503, optionally pausing the host for Retry-After seconds"""
+        with self.lock:
+            self.rate_limit_count += 1
+            self.min_delay = min(self.max_delay, max(self.min_delay, 0.5) * 1.5)
+            if pause:
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+
+class _RateLimitRetry(Retry):
+    """urllib3 Retry that reports every 429/503 as it arrives, not only once retries run out"""
+    
+    def __init__(self, *args, on_rate_limit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Called with (host, Retry-After seconds or None) for each rate limited attempt
+        self.on_rate_limit = on_rate_limit
+    
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.on_rate_limit = self.on_rate_limit
+        return retry
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if (response is not None and response.status in (429, 503)
+                and self.on_rate_limit is not None and _pool is not None):
+            self.on_rate_limit(_pool.host, self.get_retry_after(response))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
 
 class BookMyPlayerScraperPro:
-    def __init__(self, auto_save_interval: int = 1000, max_workers: int = 1, delay_between_requests: float = 0.1):
+    def __init__(self, auto_save_interval: int = 1000, max_workers: int = 16, delay_between_requests: float = 0.1,
+                 max_per_host: int = None, output_dir: str = 'output'):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Connection': 'keep-alive',
+            # gzip/deflate, plus br when brotli is installed (urllib3 only lists what it can decode)
+            'Accept-Encoding': ACCEPT_ENCODING
         })
         
+        # Connection pool sized for the worker count; urllib3 retries with exponential backoff and
+        # tells the host's throttle about each 429/503, so every worker slows down straight away
+        retry = _RateLimitRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,
+            raise_on_status=False,  # hand the final response back to fetch_page
+            on_rate_limit=self._signal_rate_limit
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers * 2, pool_maxsize=max_workers * 4, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Configuration
         self.auto_save_interval = auto_save_interval
         self.delay_between_requests = delay_between_requests
         self.max_workers = max_workers
+        self.max_per_host = max_per_host or max_workers
+        self.output_dir = output_dir
+        
+        # Per-host throttling state, created on first request to each host
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+        
+        # Parsed results waiting to be categorized and counted in one batch at the next checkpoint
+        self._pending = []
         
         # Progress tracking
         self.processed_count = 0
         self.success_count = 0
         self.error_count = 0
+        self.venue_count = self.coach_count = self.player_count = 0
         self.start_time = None
         
-        # Data storage
-        self.results = []
-        self.venue_data = []
-        self.coach_data = []
-        self.player_data = []
-        self.error_data = []
+        # Append-only NDJSON sink per result type; checkpoints only need to flush these
+        os.makedirs(output_dir, exist_ok=True)
+        self.sinks = {
+            result_type: open(os.path.join(output_dir, f'{sheet.lower()}.ndjson'), 'ab', buffering=1 << 20)
+            for result_type, sheet in _SHEETS.items()
+        }
+        # Fetch failures are retried by the next run, so their sink starts empty each run and
+        # the Errors sheet never repeats them or keeps URLs that later succeeded
+        self.sinks['failed'] = open(os.path.join(output_dir, 'failed.ndjson'), 'wb', buffering=1 << 20)
+        
+        # URLs already handled by earlier runs; resume is a set lookup, not a row index
+        try:
+            with open(os.path.join(output_dir, 'done.txt'), encoding='utf-8') as f:
+                self.done = {line.rstrip('\n') for line in f}
+        except FileNotFoundError:
+            self.done = set()
+        self.done_file = open(os.path.join(output_dir, 'done.txt'), 'a', encoding='utf-8', buffering=1)
         
         # Setup logging
         self.setup_logging()
@@ -47,7 +465,7 @@ class BookMyPlayerScraperPro:
         self.logger.info("🚀 BookMyPlayerScraperPro initialized")
         self.logger.info(f"💾 Auto-save interval: {auto_save_interval} records")
         self.logger.info(f"⚡ Request delay: {delay_between_requests} seconds")
-        self.logger.info(f"📁 Output directory: output/")
+        self.logger.info(f"📁 Output directory: {output_dir}/")
     
     def setup_logging(self):
         """Setup comprehensive logging"""
@@ -72,72 +490,107 @@ class BookMyPlayerScraperPro:
         progress_handler.setLevel(logging.INFO)
         progress_handler.setFormatter(logging.Formatter(log_format))
         
+        # Loggers only enqueue records; listener threads do the formatting and file/console I/O, so
+        # the files are written unbuffered (monitor.sh tails logs/progress.log directly)
+        self.log_listeners = []
+        
+        def queued_logger(name, *handlers):
+            log_queue = queue.Queue(-1)
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            self.log_listeners.append(listener)
+            logger = logging.getLogger(name)
+            logger.setLevel(logging.INFO)
+            logger.addHandler(QueueHandler(log_queue))
+            return logger
+        
         # Setup main logger
-        self.logger = logging.getLogger('BookMyPlayerScraper')
-        self.logger.setLevel(logging.INFO)
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        self.logger = queued_logger('BookMyPlayerScraper', file_handler, console_handler)
         
         # Setup progress logger
-        self.progress_logger = logging.getLogger('Progress')
-        self.progress_logger.setLevel(logging.INFO)
-        self.progress_logger.addHandler(progress_handler)
-        self.progress_logger.addHandler(console_handler)
+        self.progress_logger = queued_logger('Progress', progress_handler, console_handler)
+        
+        # Drain whatever is still queued when the interpreter exits
+        for listener in self.log_listeners:
+            atexit.register(listener.stop)
     
     def signal_handler(self, signum, frame):
         """Handle graceful shutdown"""
         self.logger.info(f"Received signal {signum}. Saving progress and shutting down...")
-        self.save_progress()
+        self.save_progress(export=True)
         sys.exit(0)
     
-    def fetch_page(self, url: str) -> str:
-        """Fetch page content with error handling and retries"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url, timeout=30)
+    def fetch_page(self, url: str) -> bytes:
+        """Fetch the raw page body with error handling (retries and backoff happen in the session adapter)"""
+        try:
+            headers = {
+                'User-Agent': random.choice(_USER_AGENTS),
+                'Accept-Language': random.choice(_ACCEPT_LANGUAGES)
+            }
+            # Fail fast on connect (5s) so a dead connection frees its slot; keep 30s for the body.
+            # Streamed so the headers can be checked before the body is downloaded.
+            with self.session.get(url, headers=headers, timeout=(5, 30), stream=True) as response:
+                # Rate limited attempts were already reported to the throttle by the retry policy
+                if response.ok:
+                    self._host(url).record_success()
+                elif 400 <= response.status_code < 500 and response.status_code != 429:
+                    raise _PermanentFetchError(f"HTTP {response.status_code} {response.reason}")
                 response.raise_for_status()
-                return response.text
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    self.logger.error(f"Failed to fetch {url} after {max_retries} attempts: {e}")
-                    return ""
-                else:
-                    self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}. Retrying...")
-                    time.sleep(2 ** attempt)  # Exponential backoff
-        return ""
+                
+                # Profiles are HTML (or JSON for some coaches); don't transfer anything else
+                content_type = response.headers.get('Content-Type', '').lower()
+                if content_type and not any(kind in content_type for kind in _FETCHED_CONTENT_TYPES):
+                    raise _SkippedPage(f"unexpected content type {content_type}")
+                content_length = response.headers.get('Content-Length', '')
+                if content_length.isdigit() and int(content_length) > _MAX_BODY_BYTES:
+                    raise _SkippedPage(f"body of {content_length} bytes is too large")
+                
+                # Raw bytes: response.text would run charset detection on every body. The cap is
+                # also enforced while streaming, for responses without a Content-Length
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(64 * 1024):
+                    size += len(chunk)
+                    if size > _MAX_BODY_BYTES:
+                        raise _SkippedPage(f"body exceeds {_MAX_BODY_BYTES} bytes")
+                    chunks.append(chunk)
+                return b''.join(chunks)
+        except _SkippedPage as skipped:
+            self.logger.warning("Skipping %s: %s", url, skipped)
+            raise
+        except _PermanentFetchError as e:
+            self.logger.error("Failed to fetch %s: %s", url, e)
+            raise
+        except Exception as e:
+            self.logger.error("Failed to fetch %s: %s", url, e)
+            return b""
     
     def format_phone(self, phone_str: str) -> str:
         """Format phone number properly"""
         if not phone_str:
             return ""
-        digits = re.sub(r'[^0-9]', '', str(phone_str))
+        # Already a bare 10-digit number (the usual case for id fields): nothing to strip
+        if isinstance(phone_str, str) and len(phone_str) == 10 and phone_str.isascii() and phone_str.isdigit():
+            return phone_str
+        digits = _NON_DIGIT_RE.sub('', str(phone_str))
         if len(digits) == 10:
             return digits
         elif len(digits) > 10:
             return digits[-10:]
         return phone_str
     
-    def extract_venue_fields(self, html: str, url: str) -> Dict[str, Any]:
+    def extract_venue_fields(self, html: str, url: str, tree=None, scraped_at: str = None) -> Dict[str, Any]:
         """Extract venue/academy specific fields"""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {'type': 'venue', 'url': url, 'scraped_at': datetime.now().isoformat()}
-        
-        # Direct ID extractions
-        id_fields = {
-            'academy_phone': 'phone',
-            'academy_address': 'address', 
-            'listing_title': 'name',
-            'loc_id_details': 'location_id',
-            'sport_details': 'sport',
-            'object_type_details': 'object_type',
-            'academy_phone2': 'phone2'
-        }
-        
-        for field_id, key in id_fields.items():
-            element = soup.find(attrs={'id': field_id})
-            if element:
-                value = element.get('value') or element.get_text(strip=True)
+        if tree is None:
+            tree = _parse_html(html)
+        data = {'type': 'venue', 'url': url, 'scraped_at': scraped_at or datetime.now().isoformat()}
+        
+        # Direct ID extractions (single XPath pass over the tree)
+        found = _find_ids(tree, _VENUE_ID_XPATH)
+        for field_id, key in _VENUE_ID_FIELDS.items():
+            element = found.get(field_id)
+            if element is not None:
+                value = _element_value(element)
                 if value:
                     if 'phone' in key:
                         data[key] = self.format_phone(value)
@@ -145,13 +598,12 @@ class BookMyPlayerScraperPro:
                         data[key] = value
         
         # Description from meta tag
-        desc_meta = soup.find('meta', attrs={'name': 'description'})
-        if desc_meta:
+        desc_meta = tree.find('.//meta[@name="description"]')
+        if desc_meta is not None:
             data['description'] = desc_meta.get('content', '')
         
         # Instagram URL extraction
-        instagram_pattern = r'<a href="(https://www\.instagram\.com/[^"]+)"'
-        instagram_match = re.search(instagram_pattern, html)
+        instagram_match = _INSTAGRAM_RE.search(html)
         if instagram_match:
             data['instagram_url'] = instagram_match.group(1)
         
@@ -159,41 +611,33 @@ class BookMyPlayerScraperPro:
         
         return data
     
-    def extract_coach_fields(self, html: str, url: str) -> Dict[str, Any]:
+    def extract_coach_fields(self, html: str, url: str, tree=None, scraped_at: str = None) -> Dict[str, Any]:
         """Extract coach specific fields - handles both HTML and JSON responses"""
-        data = {'type': 'coach', 'url': url, 'scraped_at': datetime.now().isoformat()}
+        data = {'type': 'coach', 'url': url, 'scraped_at': scraped_at or datetime.now().isoformat()}
         
         # First, try to detect if this is JSON data
         html_clean = html.strip()
         if html_clean.startswith('{') or html_clean.startswith('\n{'):
             # This is JSON data - extract from JSON
-            return self.extract_coach_from_json(html_clean, url)
+            return self.extract_coach_from_json(html_clean, url, scraped_at)
         
         # Otherwise, treat as HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        if tree is None:
+            tree = _parse_html(html)
+        
+        found = _find_ids(tree, _COACH_ID_XPATH)
         
         # Check if this is actually a coach page first
-        coach_indicators = [
-            soup.find(attrs={'id': 'coachName'}),
-            soup.find(attrs={'id': 'coachPhone'}),
-            soup.find(attrs={'id': 'coachAddress'})
-        ]
+        coach_indicators = ('coachName', 'coachPhone', 'coachAddress')
         
         # Only extract coach data if this looks like a coach page
-        if any(coach_indicators):
+        if any(field_id in found for field_id in coach_indicators):
             # Direct ID extractions (try multiple approaches)
-            id_fields = {
-                'coachName': 'name',
-                'coachPhone': 'phone',
-                'coachAddress': 'address',
-                'sport_details': 'sport'
-            }
-            
-            for field_id, key in id_fields.items():
+            for field_id, key in _COACH_ID_FIELDS.items():
                 # Try ID first
-                element = soup.find(attrs={'id': field_id})
-                if element:
-                    value = element.get('value') or element.get_text(strip=True)
+                element = found.get(field_id)
+                if element is not None:
+                    value = _element_value(element)
                     if value and value.strip():
                         if key == 'phone':
                             data[key] = self.format_phone(value)
@@ -203,140 +647,89 @@ class BookMyPlayerScraperPro:
                     # Try class-based extraction as fallback
                     if key == 'name':
                         # Try to find coach name in title or heading
-                        title_elem = soup.find('h1') or soup.find('title')
-                        if title_elem:
-                            title_text = title_elem.get_text(strip=True)
+                        title_elem = tree.find('.//h1')
+                        if title_elem is None:
+                            title_elem = tree.find('.//title')
+                        if title_elem is not None:
+                            title_text = _element_text(title_elem)
                             if 'coach' in title_text.lower():
                                 data[key] = title_text
         
         # Enhanced location extraction (avoid malformed content)
-        location_patterns = [
-            r'<i class="fa-solid fa-location-dot"></i>\s*([^<\n]+)',
-            r'<i class="fa-solid fa-location-dot"></i>\s*([^<]+?)(?=<|$)',
-            r'Location[:\s]*([^<\n]+)',
-            r'Address[:\s]*([^<\n]+)'
-        ]
-        
-        for pattern in location_patterns:
-            location_match = re.search(pattern, html, re.IGNORECASE)
-            if location_match:
-                location_text = location_match.group(1).strip()
-                # Clean up location text and avoid malformed content
-                if (location_text and 
-                    len(location_text) > 3 and
-                    len(location_text) < 200 and  # Avoid very long text
-                    not any(bad in location_text.lower() for bad in ['book coaching', 'training schedule', 'free trial', 'thumbnailurl', 'uploaddate', 'license', 'schema.org'])):
-                    data['location'] = location_text
-                    break
+        for location_text in _candidates(tree, _LOCATION_ICON_XPATH, _LOCATION_PATTERNS, html):
+            location_text = location_text.strip()
+            # Clean up location text and avoid malformed content
+            if (location_text and 
+                len(location_text) > 3 and
+                len(location_text) < 200 and  # Avoid very long text
+                not any(bad in location_text.lower() for bad in ['book coaching', 'training schedule', 'free trial', 'thumbnailurl', 'uploaddate', 'license', 'schema.org'])):
+                data['location'] = location_text
+                break
         
         # Enhanced email extraction (avoid generic emails and malformed content)
-        email_patterns = [
-            r'<i class="fa-regular fa-envelope"></i>\s*([^<\n]+@[^<\n]+)',
-            r'Email[:\s]*([^<\n]+@[^<\n]+)',
-            r'Contact[:\s]*([^<\n]+@[^<\n]+)',
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        ]
-        
-        for pattern in email_patterns:
-            email_match = re.search(pattern, html, re.IGNORECASE)
-            if email_match:
-                email_text = email_match.group(1).strip()
-                # Skip generic emails and malformed content
-                if (email_text and 
-                    len(email_text) < 100 and  # Avoid very long malformed text
-                    not any(generic in email_text.lower() for generic in ['care@', 'info@', 'support@', 'contact@', 'admin@']) and
-                    not any(bad in email_text.lower() for bad in ['book coaching', 'training schedule', 'free trial', 'thumbnailurl', 'uploaddate', 'license'])):
-                    data['email'] = email_text
-                    break
+        for email_text in _candidates(tree, _EMAIL_ICON_XPATH, _EMAIL_PATTERNS, html):
+            email_text = email_text.strip()
+            if '@' not in email_text:
+                continue
+            # Skip generic emails and malformed content
+            if (email_text and 
+                len(email_text) < 100 and  # Avoid very long malformed text
+                not any(generic in email_text.lower() for generic in ['care@', 'info@', 'support@', 'contact@', 'admin@']) and
+                not any(bad in email_text.lower() for bad in ['book coaching', 'training schedule', 'free trial', 'thumbnailurl', 'uploaddate', 'license'])):
+                data['email'] = email_text
+                break
         
         # Enhanced phone extraction
-        phone_patterns = [
-            r'<i class="fa-solid fa-phone"></i>\s*([^<\n]+)',
-            r'Phone[:\s]*([^<\n]+)',
-            r'Contact[:\s]*([^<\n]+)',
-            r'(\+?[0-9\s\-\(\)]{10,})'
-        ]
-        
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, html, re.IGNORECASE)
-            if phone_match:
-                phone_text = phone_match.group(1).strip()
-                if phone_text and len(re.sub(r'[^0-9]', '', phone_text)) >= 10:
-                    data['phone'] = self.format_phone(phone_text)
-                    break
+        for phone_text in _candidates(tree, _PHONE_ICON_XPATH, _PHONE_PATTERNS, html):
+            phone_text = phone_text.strip()
+            if phone_text and len(_NON_DIGIT_RE.sub('', phone_text)) >= 10:
+                data['phone'] = self.format_phone(phone_text)
+                break
         
         # Date of Birth extraction
-        dob_patterns = [
-            r'Date Of Birth[:\s]*(\d{4}-\d{2}-\d{2})',
-            r'DOB[:\s]*(\d{4}-\d{2}-\d{2})',
-            r'Born[:\s]*(\d{4}-\d{2}-\d{2})'
-        ]
-        
-        for pattern in dob_patterns:
-            dob_match = re.search(pattern, html, re.IGNORECASE)
-            if dob_match:
-                data['date_of_birth'] = dob_match.group(1)
-                break
+        for dob_text in _first_matches(_DOB_PATTERNS, html):
+            data['date_of_birth'] = dob_text
+            break
         
         # Note: Logging moved to main scrape_url function to avoid duplicate logs
         
         return data
     
-    def extract_coach_from_json(self, json_content: str, url: str) -> Dict[str, Any]:
+    def extract_fields(self, content_type: str, html: str, url: str, tree=None, scraped_at: str = None) -> Dict[str, Any]:
+        """Run the extractor for a known content type"""
+        if content_type == 'venue':
+            return self.extract_venue_fields(html, url, tree, scraped_at)
+        elif content_type == 'coach':
+            return self.extract_coach_fields(html, url, tree, scraped_at)
+        else:
+            return self.extract_player_fields(html, url, tree, scraped_at)
+    
+    def extract_coach_from_json(self, json_content: str, url: str, scraped_at: str = None) -> Dict[str, Any]:
         """Extract coach data from JSON response"""
-        data = {'type': 'coach', 'url': url, 'scraped_at': datetime.now().isoformat()}
+        data = {'type': 'coach', 'url': url, 'scraped_at': scraped_at or datetime.now().isoformat()}
         
         try:
-            # Clean the JSON content
-            json_clean = json_content.strip()
-            if json_clean.startswith('\n'):
-                json_clean = json_clean[1:]
-            
             # Check if content is empty
-            if not json_clean:
-                self.logger.warning(f"Empty JSON content for coach URL: {url}")
+            if not json_content or json_content.isspace():
+                self.logger.warning("Empty JSON content for coach URL: %s", url)
                 return data
             
-            # Parse JSON
-            json_data = json.loads(json_clean)
+            # Parse JSON; orjson skips surrounding whitespace itself, so no stripped copy is made
+            json_data = orjson.loads(json_content)
             
             # Extract coach data from 'd' key
             if 'd' in json_data:
                 coach_info = json_data['d']
                 
-                # Map JSON fields to our data structure
-                field_mapping = {
-                    'name': 'name',
-                    'phone': 'phone',
-                    'email': 'email',
-                    'address': 'address',
-                    'city': 'city',
-                    'state': 'state',
-                    'sport': 'sport',
-                    'experience': 'experience',
-                    'education': 'education',
-                    'achievement': 'achievement',
-                    'skill': 'skills',
-                    'heighlight': 'highlight',
-                    'fee': 'fee',
-                    'package': 'package',
-                    'gender': 'gender',
-                    'location': 'location',
-                    'certificate': 'certificate',
-                    'about': 'about',
-                    'postcode': 'postcode',
-                    'lat': 'latitude',
-                    'lng': 'longitude'
-                }
-                
-                for json_key, data_key in field_mapping.items():
-                    if json_key in coach_info and coach_info[json_key] is not None:
-                        value = coach_info[json_key]
-                        if value and str(value).strip():
-                            if data_key == 'phone':
-                                data[data_key] = self.format_phone(str(value))
-                            else:
-                                data[data_key] = str(value)
+                # Map JSON fields to our data structure (one lookup and one str() per field)
+                for json_key, data_key in _COACH_JSON_FIELDS.items():
+                    value = coach_info.get(json_key)
+                    if not value:
+                        continue
+                    value = str(value)
+                    if not value.strip():
+                        continue
+                    data[data_key] = self.format_phone(value) if data_key == 'phone' else value
                 
                 # Create location string from city and state
                 if 'city' in data and 'state' in data:
@@ -357,32 +750,26 @@ class BookMyPlayerScraperPro:
             else:
                 self.logger.warning("No 'd' key found in coach JSON data")
                 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse coach JSON: {e}")
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Failed to parse coach JSON: %s", e)
         except Exception as e:
-            self.logger.error(f"Error extracting coach from JSON: {e}")
+            self.logger.error("Error extracting coach from JSON: %s", e)
         
         return data
     
-    def extract_player_fields(self, html: str, url: str) -> Dict[str, Any]:
+    def extract_player_fields(self, html: str, url: str, tree=None, scraped_at: str = None) -> Dict[str, Any]:
         """Extract player specific fields"""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {'type': 'player', 'url': url, 'scraped_at': datetime.now().isoformat()}
-        
-        # Direct ID extractions (try multiple approaches)
-        id_fields = {
-            'playerAddress': 'address',
-            'playerPhone': 'phone',
-            'playerName': 'name',
-            'loc_id_details': 'location_id',
-            'object_id_details': 'object_id'
-        }
+        if tree is None:
+            tree = _parse_html(html)
+        data = {'type': 'player', 'url': url, 'scraped_at': scraped_at or datetime.now().isoformat()}
         
-        for field_id, key in id_fields.items():
+        # Direct ID extractions (single XPath pass over the tree)
+        found = _find_ids(tree, _PLAYER_ID_XPATH)
+        for field_id, key in _PLAYER_ID_FIELDS.items():
             # Try ID first
-            element = soup.find(attrs={'id': field_id})
-            if element:
-                value = element.get('value') or element.get_text(strip=True)
+            element = found.get(field_id)
+            if element is not None:
+                value = _element_value(element)
                 if value and value.strip():
                     if key == 'phone':
                         data[key] = self.format_phone(value)
@@ -392,25 +779,21 @@ class BookMyPlayerScraperPro:
         # Enhanced name extraction - only for actual player pages
         if not data.get('name'):
             # Check if this is actually a player page by looking for player-specific elements
-            player_indicators = [
-                soup.find(attrs={'id': 'playerName'}),
-                soup.find(attrs={'id': 'playerPhone'}),
-                soup.find(attrs={'id': 'playerAddress'})
-            ]
+            player_indicators = ('playerName', 'playerPhone', 'playerAddress')
             
             # Only extract name if this looks like a player page
-            if any(player_indicators):
+            if any(field_id in found for field_id in player_indicators):
                 # Try h1 tag first
-                h1_elem = soup.find('h1')
-                if h1_elem:
-                    h1_text = h1_elem.get_text(strip=True)
+                h1_elem = tree.find('.//h1')
+                if h1_elem is not None:
+                    h1_text = _element_text(h1_elem)
                     if h1_text and len(h1_text) > 3:
                         data['name'] = h1_text
                 else:
                     # Try title tag
-                    title_elem = soup.find('title')
-                    if title_elem:
-                        title_text = title_elem.get_text(strip=True)
+                    title_elem = tree.find('.//title')
+                    if title_elem is not None:
+                        title_text = _element_text(title_elem)
                         # Extract name from title (remove " - Basketball Player in Noida" part)
                         if ' - ' in title_text:
                             data['name'] = title_text.split(' - ')[0]
@@ -418,92 +801,68 @@ class BookMyPlayerScraperPro:
                             data['name'] = title_text
         
         # Enhanced location extraction
-        location_patterns = [
-            r'<i class="fa-solid fa-location-dot"></i>\s*([^<\n]+?)</p>',
-            r'<i class="fa-solid fa-location-dot"></i>\s*([^<\n]+)',
-            r'<i class="fa-solid fa-location-dot"></i>\s*([^<]+?)(?=<|$)',
-            r'Location[:\s]*([^<\n]+)',
-            r'Address[:\s]*([^<\n]+)'
-        ]
-        
-        for pattern in location_patterns:
-            location_match = re.search(pattern, html, re.IGNORECASE)
-            if location_match:
-                location_text = location_match.group(1).strip()
-                # Clean up location text and avoid long descriptions
-                if (location_text and 
-                    len(location_text) > 3 and 
-                    len(location_text) < 200 and  # Avoid very long text
-                    location_text != '-' and
-                    not any(bad in location_text.lower() for bad in ['book coaching', 'training schedule', 'free trial', 'description'])):
-                    data['location'] = location_text
-                    break
+        for location_text in _candidates(tree, _LOCATION_ICON_XPATH, _LOCATION_PATTERNS, html):
+            location_text = location_text.strip()
+            # Clean up location text and avoid long descriptions
+            if (location_text and 
+                len(location_text) > 3 and 
+                len(location_text) < 200 and  # Avoid very long text
+                location_text != '-' and
+                not any(bad in location_text.lower() for bad in ['book coaching', 'training schedule', 'free trial', 'description'])):
+                data['location'] = location_text
+                break
         
         # Enhanced email extraction (avoid generic emails and empty values)
-        email_patterns = [
-            r'<i class="fa-regular fa-envelope"></i>\s*([^<\n]+@[^<\n]+)',
-            r'<i class="fa-regular fa-envelope"></i>\s*([^<]*)</p>',
-            r'Email[:\s]*([^<\n]+@[^<\n]+)',
-            r'Contact[:\s]*([^<\n]+@[^<\n]+)',
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        ]
-        
-        for pattern in email_patterns:
-            email_match = re.search(pattern, html, re.IGNORECASE)
-            if email_match:
-                email_text = email_match.group(1).strip()
-                # Skip generic emails, empty values, and malformed text
-                if (email_text and 
-                    email_text != '-' and 
-                    '@' in email_text and
-                    len(email_text) < 100 and  # Avoid long malformed text
-                    not any(generic in email_text.lower() for generic in ['care@', 'info@', 'support@', 'contact@', 'admin@']) and
-                    not any(bad in email_text.lower() for bad in ['book coaching', 'training schedule', 'free trial'])):
-                    data['email'] = email_text
-                    break
+        for email_text in _candidates(tree, _EMAIL_ICON_XPATH, _EMAIL_PATTERNS, html):
+            email_text = email_text.strip()
+            # Skip generic emails, empty values, and malformed text
+            if (email_text and 
+                email_text != '-' and 
+                '@' in email_text and
+                len(email_text) < 100 and  # Avoid long malformed text
+                not any(generic in email_text.lower() for generic in ['care@', 'info@', 'support@', 'contact@', 'admin@']) and
+                not any(bad in email_text.lower() for bad in ['book coaching', 'training schedule', 'free trial'])):
+                data['email'] = email_text
+                break
         
         # Enhanced phone extraction
-        phone_patterns = [
-            r'<i class="fa-solid fa-phone"></i>\s*([^<\n]+)',
-            r'Phone[:\s]*([^<\n]+)',
-            r'Contact[:\s]*([^<\n]+)',
-            r'(\+?[0-9\s\-\(\)]{10,})'
-        ]
-        
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, html, re.IGNORECASE)
-            if phone_match:
-                phone_text = phone_match.group(1).strip()
-                if phone_text and len(re.sub(r'[^0-9]', '', phone_text)) >= 10:
-                    data['phone'] = self.format_phone(phone_text)
-                    break
+        for phone_text in _candidates(tree, _PHONE_ICON_XPATH, _PHONE_PATTERNS, html):
+            phone_text = phone_text.strip()
+            if phone_text and len(_NON_DIGIT_RE.sub('', phone_text)) >= 10:
+                data['phone'] = self.format_phone(phone_text)
+                break
         
         # Note: Logging moved to main scrape_url function to avoid duplicate logs
         
         return data
     
-    def detect_content_type(self, html: str, url: str) -> tuple[str, dict]:
+    def detect_content_type(self, html: str, url: str, scraped_at: str = None, tree=None) -> tuple[str, dict]:
         """Detect content type using brute force - try all extraction methods and pick the best one"""
+        scraped_at = scraped_at or datetime.now().isoformat()
+        
+        # Parse once and share the tree between the listing check and all three extractors
+        if tree is None:
+            tree = _parse_html(html)
         
         # First check if this is a listing page (not an individual profile)
-        if self._is_listing_page(url, html):
-            self.logger.warning(f"LISTING PAGE DETECTED: {url} - Skipping extraction")
-            return 'listing', {'url': url, 'type': 'listing', 'scraped_at': datetime.now().isoformat()}
+        if self._is_listing_page(url, html, tree):
+            self.logger.warning("LISTING PAGE DETECTED: %s - Skipping extraction", url)
+            return 'listing', {'url': url, 'type': 'listing', 'scraped_at': scraped_at}
         
         # Try venue extraction first
-        venue_data = self.extract_venue_fields(html, url)
+        venue_data = self.extract_venue_fields(html, url, tree, scraped_at)
         venue_score = self._calculate_extraction_score(venue_data, 'venue')
         
         # Try player extraction
-        player_data = self.extract_player_fields(html, url)
+        player_data = self.extract_player_fields(html, url, tree, scraped_at)
         player_score = self._calculate_extraction_score(player_data, 'player')
         
         # Try coach extraction (both HTML and JSON)
-        coach_data = self.extract_coach_fields(html, url)
+        coach_data = self.extract_coach_fields(html, url, tree, scraped_at)
         coach_score = self._calculate_extraction_score(coach_data, 'coach')
         
         # Debug logging
-        self.logger.debug(f"Extraction scores - Venue: {venue_score}, Player: {player_score}, Coach: {coach_score}")
+        self.logger.debug("Extraction scores - Venue: %s, Player: %s, Coach: %s", venue_score, player_score, coach_score)
         
         # Return the type with the highest score and its data
         scores = {
@@ -526,7 +885,7 @@ class BookMyPlayerScraperPro:
         else:
             # Fallback to URL-based detection if all scores are 0
             fallback_type = self._fallback_url_detection(url)
-            return fallback_type, data_map.get(fallback_type, {'url': url, 'type': fallback_type, 'scraped_at': datetime.now().isoformat()})
+            return fallback_type, data_map.get(fallback_type, {'url': url, 'type': fallback_type, 'scraped_at': scraped_at})
     
     def _calculate_extraction_score(self, data: dict, content_type: str) -> int:
         """Calculate how well the extraction worked (higher score = better match)"""
@@ -577,43 +936,23 @@ class BookMyPlayerScraperPro:
     
     def _fallback_url_detection(self, url: str) -> str:
         """Fallback URL-based detection when brute force fails"""
-        url_lower = url.lower()
-        
-        # Check for listing pages first (these should be skipped or handled differently)
-        listing_patterns = [
-            '-coaches-in-', '-players-in-', '-gyms-in-', 
-            '-academies-in-', '-clubs-in-', 'clid-', 'pid-', 'aid-'
-        ]
-        
-        # If it's a listing page, try to determine the type
-        if any(pattern in url_lower for pattern in listing_patterns):
-            if '-coaches-in-' in url_lower or 'clid-' in url_lower:
-                return 'coach'
-            elif '-players-in-' in url_lower or 'pid-' in url_lower:
-                return 'player'
-            elif '-gyms-in-' in url_lower or '-academies-in-' in url_lower or 'aid-' in url_lower:
-                return 'venue'
-        
-        # Individual profile patterns
-        venue_patterns = [
-            '/gym/', '/academy', 'academy', '/school', 'school', 
-            '/club', 'club', '/fc', 'fc', '/acad', 'acad',
-            '-aid-', '/aid-', 'football-accademy', 'football-academy'
-        ]
-        if any(pattern in url_lower for pattern in venue_patterns):
-            return 'venue'
-        
-        # Coach patterns
-        if 'coach' in url_lower or '-chid-' in url_lower:
-            return 'coach' 
-        
-        # Player patterns
-        if 'player' in url_lower or '-pid-' in url_lower:
-            return 'player'
-        
+        # First matching rule wins: listing pages (by type), then individual profile patterns.
+        # Only the path is tested; the host name itself contains "player"
+        path = urlparse(url).path
+        for pattern, content_type in _URL_TYPE_RULES:
+            if pattern.search(path):
+                return content_type
+        return 'unknown'
+    
+    def _profile_id_type(self, url: str) -> str:
+        """Type given by an explicit profile id in the URL path, or 'unknown'"""
+        path = urlparse(url).path
+        for pattern, content_type in _PROFILE_ID_RULES:
+            if pattern.search(path):
+                return content_type
         return 'unknown'
     
-    def _is_listing_page(self, url: str, html: str) -> bool:
+    def _is_listing_page(self, url: str, html: str, tree=None) -> bool:
         """Check if this is a listing page rather than an individual profile"""
         url_lower = url.lower()
         
@@ -637,26 +976,12 @@ class BookMyPlayerScraperPro:
         if any(pattern in url_lower for pattern in individual_profile_patterns):
             return False
         
-        # Check HTML content for listing page indicators
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Look for listing page indicators
-        listing_indicators = [
-            # Multiple profile cards or listings
-            soup.find_all('div', class_=lambda x: x and 'card' in x.lower()),
-            soup.find_all('div', class_=lambda x: x and 'listing' in x.lower()),
-            soup.find_all('div', class_=lambda x: x and 'profile' in x.lower()),
-            # Search/filter elements
-            soup.find('input', {'type': 'search'}),
-            soup.find('select', {'name': lambda x: x and 'filter' in x.lower()}),
-            # Pagination
-            soup.find('nav', {'aria-label': 'pagination'}),
-            soup.find('ul', class_=lambda x: x and 'pagination' in x.lower()),
-        ]
+        # Check HTML content for listing page indicators, reusing the caller's tree when given
+        if tree is None:
+            tree = _parse_html(html)
         
         # If we find multiple indicators, it's likely a listing page
-        non_empty_indicators = [ind for ind in listing_indicators if ind]
-        if len(non_empty_indicators) >= 2:
+        if sum(1 for indicator in _LISTING_INDICATOR_XPATHS if indicator(tree)) >= 2:
             return True
         
         # Check for specific text patterns that indicate listing pages
@@ -666,7 +991,7 @@ class BookMyPlayerScraperPro:
             'total results', 'found', 'matches'
         ]
         
-        page_text = soup.get_text().lower()
+        page_text = ''.join(_VISIBLE_TEXT_XPATH(tree)).lower()
         if any(pattern in page_text for pattern in listing_text_patterns):
             return True
         
@@ -675,119 +1000,197 @@ class BookMyPlayerScraperPro:
     def scrape_url(self, url: str) -> Dict[str, Any]:
         """Main scraping function that auto-detects type and extracts appropriate fields"""
         try:
-            html = self.fetch_page(url)
+            return self.parse_page(self.fetch_page(url), url)
+        except _SkippedPage as skipped:
+            return self.skipped_result(url, skipped)
+        except _PermanentFetchError as e:
+            return self.permanent_error_result(url, e)
+    
+    @staticmethod
+    def skipped_result(url: str, reason) -> Dict[str, Any]:
+        """Result for a page that was deliberately not downloaded; it is recorded and marked done"""
+        return {'url': url, 'type': 'skipped', 'reason': str(reason), 'scraped_at': datetime.now().isoformat()}
+    
+    @staticmethod
+    def permanent_error_result(url: str, error) -> Dict[str, Any]:
+        """Result for a fetch that failed for good (e.g. 404); unlike _FETCH_FAILED it is marked done"""
+        return {'url': url, 'type': 'error', 'error': str(error), 'scraped_at': datetime.now().isoformat()}
+    
+    def parse_page(self, html, url: str, tree=None) -> Dict[str, Any]:
+        """Auto-detect the type of an already fetched page and extract its fields"""
+        # One timestamp per page, shared by whichever extractors run
+        scraped_at = datetime.now().isoformat()
+        try:
             if not html:
-                return {'url': url, 'type': 'error', 'error': 'Failed to fetch page', 'scraped_at': datetime.now().isoformat()}
+                return {'url': url, 'type': 'error', 'error': _FETCH_FAILED, 'scraped_at': scraped_at}
+            
+            # lxml parses the raw bytes; the regex fallbacks get one UTF-8 decode of the same body
+            body = html
+            if isinstance(html, bytes):
+                html = html.decode('utf-8', 'replace')
             
-            # Use brute force detection - tries all extraction methods and picks the best one
-            content_type, extracted_data = self.detect_content_type(html, url)
+            # The page is parsed exactly once (usually already in the fetch thread); the listing
+            # check and the extractors share the tree
+            if tree is None and not _is_json(html):
+                tree = _parse_html(body)
             
-            if content_type in ['venue', 'coach', 'player']:
-                # Log the final extraction result (only the best one)
+            # A profile id in the URL settles the type, so extract once with the matching
+            # extractor; every other URL pays for brute force detection. Listing pages are
+            # ruled out first on both paths
+            url_type = self._profile_id_type(url)
+            if url_type != 'unknown' and not self._is_listing_page(url, html, tree):
+                content_type = url_type
+                extracted_data = self.extract_fields(content_type, html, url, tree, scraped_at)
+            else:
+                # Brute force detection - tries all extraction methods and picks the best one
+                content_type, extracted_data = self.detect_content_type(html, url, scraped_at, tree)
+            
+            if content_type in _PROFILE_TYPES:
+                # Per-record detail goes to DEBUG; %-style args are only formatted if it is enabled
                 if content_type == 'venue':
-                    venue_name = extracted_data.get('name', 'Unknown')
-                    venue_phone = extracted_data.get('phone', 'No phone')
-                    venue_address = extracted_data.get('address', 'No address')
-                    self.logger.info(f"VENUE EXTRACTED: {venue_name} | Phone: {venue_phone} | Address: {venue_address}")
+                    self.logger.debug("VENUE EXTRACTED: %s | Phone: %s | Address: %s",
+                                      extracted_data.get('name', 'Unknown'),
+                                      extracted_data.get('phone', 'No phone'),
+                                      extracted_data.get('address', 'No address'))
                 elif content_type == 'coach':
-                    coach_name = extracted_data.get('name', 'Unknown')
-                    coach_phone = extracted_data.get('phone', 'No phone')
-                    coach_email = extracted_data.get('email', 'No email')
-                    coach_location = extracted_data.get('location', 'No location')
-                    self.logger.info(f"COACH EXTRACTED: {coach_name} | Phone: {coach_phone} | Email: {coach_email} | Location: {coach_location}")
+                    self.logger.debug("COACH EXTRACTED: %s | Phone: %s | Email: %s | Location: %s",
+                                      extracted_data.get('name', 'Unknown'),
+                                      extracted_data.get('phone', 'No phone'),
+                                      extracted_data.get('email', 'No email'),
+                                      extracted_data.get('location', 'No location'))
                 elif content_type == 'player':
-                    player_name = extracted_data.get('name', 'Unknown')
-                    player_phone = extracted_data.get('phone', 'No phone')
-                    player_email = extracted_data.get('email', 'No email')
-                    player_location = extracted_data.get('location', 'No location')
-                    self.logger.info(f"PLAYER EXTRACTED: {player_name} | Phone: {player_phone} | Email: {player_email} | Location: {player_location}")
+                    self.logger.debug("PLAYER EXTRACTED: %s | Phone: %s | Email: %s | Location: %s",
+                                      extracted_data.get('name', 'Unknown'),
+                                      extracted_data.get('phone', 'No phone'),
+                                      extracted_data.get('email', 'No email'),
+                                      extracted_data.get('location', 'No location'))
                 
                 return extracted_data
             else:
-                self.logger.warning(f"UNKNOWN TYPE: {url} - Could not determine content type")
-                return {'url': url, 'type': 'unknown', 'error': 'Could not determine content type', 'scraped_at': datetime.now().isoformat()}
+                self.logger.warning("UNKNOWN TYPE: %s - Could not determine content type", url)
+                return {'url': url, 'type': 'unknown', 'error': 'Could not determine content type', 'scraped_at': scraped_at}
         except Exception as e:
-            self.logger.error(f"ERROR SCRAPING: {url} - {e}")
-            return {'url': url, 'type': 'error', 'error': str(e), 'scraped_at': datetime.now().isoformat()}
+            self.logger.error("ERROR SCRAPING: %s - %s", url, e)
+            return {'url': url, 'type': 'error', 'error': str(e), 'scraped_at': scraped_at}
     
-    def categorize_result(self, result: Dict[str, Any]):
-        """Categorize result into appropriate list"""
+    def categorize_result(self, result: Dict[str, Any]) -> Optional[str]:
+        """Count result by type and return the sink it belongs in (None to skip)"""
         if result['type'] == 'venue':
-            self.venue_data.append(result)
+            self.venue_count += 1
         elif result['type'] == 'coach':
-            self.coach_data.append(result)
+            self.coach_count += 1
         elif result['type'] == 'player':
-            self.player_data.append(result)
+            self.player_count += 1
         elif result['type'] == 'listing':
             # Skip listing pages - they don't contain individual profile data
-            self.logger.info(f"SKIPPED LISTING PAGE: {result['url']}")
-            return
+            self.logger.debug("SKIPPED LISTING PAGE: %s", result['url'])
+            return None
+        elif result.get('error') == _FETCH_FAILED:
+            return 'failed'
         else:
-            self.error_data.append(result)
+            return 'error'
+        
+        return result['type']
     
-    def save_progress(self, filename_prefix: str = "bookmyplayer_progress"):
-        """Save current progress to Excel file with robust error handling"""
+    def export_excel(self, filename: str):
+        """Write everything collected in the NDJSON sinks to a single Excel workbook"""
+        # Written under a temporary name and renamed, so a crash never leaves a truncated workbook
+        root, ext = os.path.splitext(filename)
+        tmp_filename = f"{root}.tmp{ext}"
+        # constant_memory flushes each row to disk as soon as the next one starts, so the export
+        # never holds a sheet in memory; keep URLs as plain strings like openpyxl did
+        workbook = xlsxwriter.Workbook(tmp_filename, {'constant_memory': True, 'strings_to_urls': False})
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        try:
+            for result_type, sheet in _SHEETS.items():
+                paths = [self.sinks[result_type].name]
+                if result_type == 'error':
+                    # This run's fetch failures are listed with the other errors
+                    paths.append(self.sinks['failed'].name)
+                paths = [path for path in paths if os.path.getsize(path)]
+                if not paths:
+                    continue
+                # Columns in first-seen order across the sinks, as a DataFrame built from the rows would have
+                columns = {}
+                for path in paths:
+                    with open(path, 'rb') as f:
+                        columns.update(dict.fromkeys(key for line in f for key in orjson.loads(line)))
+                columns = list(columns)
+                worksheet = workbook.add_worksheet(sheet)
+                worksheet.write_row(0, 0, columns, header_format)
+                # Second pass streams the rows; values stay as scraped (phones stay strings, dates are not parsed)
+                rows = 0
+                for path in paths:
+                    with open(path, 'rb') as f:
+                        for rows, line in enumerate(f, start=rows + 1):
+                            record = orjson.loads(line)
+                            worksheet.write_row(rows, 0, [record.get(column) for column in columns])
+                self.logger.info(f"Saved {rows} {sheet.lower()} to Excel")
+        finally:
+            workbook.close()
+        os.replace(tmp_filename, filename)
+    
+    def save_progress(self, filename_prefix: str = "bookmyplayer_progress", export: bool = False):
+        """Checkpoint progress by flushing the result sinks, optionally exporting them to Excel"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"output/{filename_prefix}_{timestamp}.xlsx"
+        filename = os.path.join(self.output_dir, f"{filename_prefix}_{timestamp}.xlsx") if export else None
         
         # Ensure output directory exists
         try:
-            os.makedirs('output', exist_ok=True)
-            self.logger.info(f"Output directory ensured: output/")
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.logger.info("Output directory ensured: %s/", self.output_dir)
         except Exception as e:
-            self.logger.error(f"Failed to create output directory: {e}")
+            self.logger.error("Failed to create output directory: %s", e)
             return None
         
         try:
-            # Create Excel file with all data
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                if self.venue_data:
-                    pd.DataFrame(self.venue_data).to_excel(writer, sheet_name='Venues', index=False)
-                    self.logger.info(f"Saved {len(self.venue_data)} venues to Excel")
-                if self.coach_data:
-                    pd.DataFrame(self.coach_data).to_excel(writer, sheet_name='Coaches', index=False)
-                    self.logger.info(f"Saved {len(self.coach_data)} coaches to Excel")
-                if self.player_data:
-                    pd.DataFrame(self.player_data).to_excel(writer, sheet_name='Players', index=False)
-                    self.logger.info(f"Saved {len(self.player_data)} players to Excel")
-                if self.error_data:
-                    pd.DataFrame(self.error_data).to_excel(writer, sheet_name='Errors', index=False)
-                    self.logger.info(f"Saved {len(self.error_data)} errors to Excel")
+            # Appending to the sinks is O(batch); a checkpoint only has to flush them
+            self.flush_batch()
+            for sink in self.sinks.values():
+                sink.flush()
+                # Make the checkpoint durable, not just handed to the OS
+                os.fsync(sink.fileno())
+            
+            # The (full) Excel export only happens on request, typically once at the end
+            if export:
+                self.export_excel(filename)
             
             # Save progress stats
             stats = {
                 'processed': self.processed_count,
                 'success': self.success_count,
                 'errors': self.error_count,
-                'venues': len(self.venue_data),
-                'coaches': len(self.coach_data),
-                'players': len(self.player_data),
+                'venues': self.venue_count,
+                'coaches': self.coach_count,
+                'players': self.player_count,
                 'timestamp': timestamp,
-                'filename': filename,
+                'filename': filename or os.path.join(self.output_dir, '*.ndjson'),
                 'elapsed_time': time.time() - self.start_time if self.start_time else 0
             }
             
-            stats_filename = f"output/stats_{timestamp}.json"
-            with open(stats_filename, 'w') as f:
-                json.dump(stats, f, indent=2)
+            stats_filename = os.path.join(self.output_dir, f"stats_{timestamp}.json")
+            _write_atomic(stats_filename, orjson.dumps(stats, option=orjson.OPT_INDENT_2))
             
             # Verify files were created
-            if os.path.exists(filename) and os.path.exists(stats_filename):
-                file_size = os.path.getsize(filename)
-                self.logger.info(f"✅ PROGRESS SAVED: {filename} ({file_size} bytes)")
-                self.logger.info(f"✅ STATS SAVED: {stats_filename}")
-                self.logger.info(f"📊 STATS: Processed={self.processed_count}, Success={self.success_count}, Errors={self.error_count}")
-                self.logger.info(f"📊 DATA: Venues={len(self.venue_data)}, Coaches={len(self.coach_data)}, Players={len(self.player_data)}")
-                return filename
+            if (filename is None or os.path.exists(filename)) and os.path.exists(stats_filename):
+                if filename:
+                    file_size = os.path.getsize(filename)
+                    self.logger.info("✅ PROGRESS SAVED: %s (%d bytes)", filename, file_size)
+                else:
+                    self.logger.info("✅ PROGRESS FLUSHED: %s/*.ndjson", self.output_dir)
+                self.logger.info("✅ STATS SAVED: %s", stats_filename)
+                self.logger.info("📊 STATS: Processed=%d, Success=%d, Errors=%d", self.processed_count, self.success_count, self.error_count)
+                self.logger.info("📊 DATA: Venues=%d, Coaches=%d, Players=%d", self.venue_count, self.coach_count, self.player_count)
+                return filename or stats_filename
             else:
-                self.logger.error(f"❌ Files not created properly: {filename}")
+                self.logger.error("❌ Files not created properly: %s", filename)
                 return None
             
         except Exception as e:
-            self.logger.error(f"❌ FAILED TO SAVE PROGRESS: {e}")
-            self.logger.error(f"Error type: {type(e).__name__}")
+            self.logger.error("❌ FAILED TO SAVE PROGRESS: %s", e)
+            self.logger.error("Error type: %s", type(e).__name__)
             import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            self.logger.error("Traceback: %s", traceback.format_exc())
             return None
     
     def get_processing_stats(self):
@@ -803,104 +1206,271 @@ class BookMyPlayerScraperPro:
             'processed': self.processed_count,
             'success': self.success_count,
             'errors': self.error_count,
-            'venues': len(self.venue_data),
-            'coaches': len(self.coach_data),
-            'players': len(self.player_data),
+            'venues': self.venue_count,
+            'coaches': self.coach_count,
+            'players': self.player_count,
             'elapsed_time': elapsed_time,
             'rate_per_second': rate,
             'rate_per_minute': rate * 60
         }
     
-    def process_urls_from_excel(self, input_file: str, url_column: str = 'url', start_from: int = 0):
-        """Process URLs from Excel file with auto-save and progress tracking"""
-        self.logger.info(f"Loading URLs from {input_file}")
-        
+    def _host(self, url: str) -> HostThrottle:
+        """Throttling state for the URL's host"""
+        return self._throttle(urlparse(url).hostname)
+    
+    def _signal_rate_limit(self, host: str, retry_after: Optional[float]):
+        """Retry policy callback: back the host off for every rate limited attempt"""
+        self._throttle(host).signal_rate_limit(retry_after)
+    
+    def _throttle(self, host: str) -> HostThrottle:
+        """Throttling state for a host name, created on first use"""
+        with self._hosts_lock:
+            throttle = self._hosts.get(host)
+            if throttle is None:
+                throttle = self._hosts[host] = HostThrottle(self.delay_between_requests, self.max_per_host)
+        return throttle
+    
+    def fetch_page_paced(self, url: str) -> bytes:
+        """Fetch a URL from a pool worker, holding a per-host slot and honouring the host's adaptive delay"""
+        throttle = self._host(url)
+        with throttle.slots:
+            time.sleep(throttle.time_until_next())
+            return self.fetch_page(url)
+    
+    def fetch_and_parse(self, url: str):
+        """Pool worker: fetch a page and build its lxml tree; libxml2 parses without holding the GIL"""
+        body = self.fetch_page_paced(url)
+        tree = _parse_html(body) if body and not _is_json(body) else None
+        return body, tree
+    
+    def record_result(self, future, i: int, url: str):
+        """Parse a fetched page and buffer the result; categorizing and counting happen per batch"""
         try:
-            # Read Excel file
-            if input_file.endswith('.xlsx') or input_file.endswith('.xls'):
-                df = pd.read_excel(input_file)
+            try:
+                body, tree = future.result()
+                result = self.parse_page(body, url, tree)
+            except _SkippedPage as skipped:
+                result = self.skipped_result(url, skipped)
+            except _PermanentFetchError as e:
+                result = self.permanent_error_result(url, e)
+            self._pending.append(result)
+            
+            # Auto-save check - with detailed logging
+            if (self.processed_count + len(self._pending)) % self.auto_save_interval == 0:
+                self.flush_batch()
+                stats = self.get_processing_stats()
+                self.logger.info("🔄 AUTO-SAVE TRIGGERED at %d records | Rate: %.1f URLs/s",
+                                 self.processed_count, stats['rate_per_second'])
+                save_result = self.save_progress()
+                if save_result:
+                    self.logger.info("✅ AUTO-SAVE SUCCESS: %s", save_result)
+                else:
+                    self.logger.error("❌ AUTO-SAVE FAILED at %d records", self.processed_count)
+        
+        except Exception as e:
+            self.logger.error("Error processing URL %s: %s - %s", i, url, e)
+            self.error_count += 1
+            self.processed_count += 1
+    
+    def flush_batch(self):
+        """Categorize, count and checkpoint all buffered results in one pass"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        
+        lines = {result_type: [] for result_type in self.sinks}
+        categorize = self.categorize_result
+        successes = 0
+        for result in batch:
+            sink_type = categorize(result)
+            if sink_type:
+                lines[sink_type].append(orjson.dumps(result))
+            if result['type'] in _PROFILE_TYPES:
+                successes += 1
+        # Counters on self are only touched once per batch
+        self.success_count += successes
+        self.error_count += len(batch) - successes
+        self.processed_count += len(batch)
+        
+        # One buffered write per sink for the whole batch, pushed out of the buffer before the
+        # batch's URLs are marked done
+        for result_type, rows in lines.items():
+            if rows:
+                sink = self.sinks[result_type]
+                sink.write(b'\n'.join(rows) + b'\n')
+                sink.flush()
+        
+        # Only mark URLs done once their results are in the sinks; failed fetches stay pending so
+        # a re-run retries them instead of treating them as finished
+        self.done_file.write(''.join(result['url'] + '\n' for result in batch
+                                     if result.get('error') != _FETCH_FAILED))
+    
+    @staticmethod
+    def _clean_urls(column: pd.Series) -> pd.Series:
+        """Strip whitespace and drop blank cells for a whole column at once"""
+        urls = column.dropna().str.strip()
+        return urls[urls != '']
+    
+    def open_url_source(self, input_file: str, url_column: str) -> Tuple[Iterator[str], Optional[int]]:
+        """Stream URLs from the input file, returning (urls, row count if cheaply known)
+
+        url_column is a header name, or a 0-based column index for sheets without a header row.
+        """
+        if input_file.endswith('.xlsx'):
+            # Read-only mode streams rows from the sheet XML instead of building the workbook
+            wb = openpyxl.load_workbook(input_file, read_only=True, data_only=True)
+            ws = wb.active
+            rows = ws.iter_rows(values_only=True)
+            # Like pandas, the first row is the header
+            first = next(rows, ())
+            header = [str(cell) for cell in first]
+            if url_column in header:
+                col = header.index(url_column)
+                header_rows = 1
+            elif url_column.isdigit():
+                # Headerless sheet addressed by position: the first row is already a URL
+                col = int(url_column)
+                rows = chain([first], rows)
+                header_rows = 0
             else:
-                df = pd.read_csv(input_file)
+                wb.close()
+                raise ValueError(f"Column '{url_column}' not found in file. Available columns: {header}")
             
-            if url_column not in df.columns:
-                raise ValueError(f"Column '{url_column}' not found in file. Available columns: {df.columns.tolist()}")
+            def urls():
+                try:
+                    for row in rows:
+                        if col < len(row) and row[col] is not None:
+                            url = str(row[col]).strip()
+                            if url:
+                                yield url
+                finally:
+                    wb.close()
             
-            urls = df[url_column].dropna().astype(str).tolist()
+            return urls(), (ws.max_row - header_rows if ws.max_row else None)
+        
+        # pandas readers: a numeric column that isn't a header name means a headerless file
+        if input_file.endswith('.xls'):
+            header_names = pd.read_excel(input_file, nrows=0).columns
+        else:
+            header_names = pd.read_csv(input_file, nrows=0).columns
+        if url_column not in header_names and url_column.isdigit():
+            column, header = int(url_column), None
+        else:
+            column, header = url_column, 0
+        
+        if input_file.endswith('.xls'):
+            # Legacy format has no streaming reader; load just the URL column
+            df = pd.read_excel(input_file, usecols=[column], header=header, dtype=str)
+            return iter(self._clean_urls(df[column]).tolist()), len(df)
+        
+        def csv_urls():
+            for chunk in pd.read_csv(input_file, usecols=[column], header=header, dtype=str, chunksize=10000):
+                yield from self._clean_urls(chunk[column])
+        
+        return csv_urls(), None
+    
+    def process_urls_from_excel(self, input_file: str, url_column: str = 'url', start_from: int = 0,
+                                shard: int = 0, num_shards: int = 1):
+        """Process URLs from Excel file with auto-save and progress tracking"""
+        self.logger.info(f"Loading URLs from {input_file}")
+        
+        try:
+            # URLs are streamed, so memory stays flat and scraping starts immediately
+            urls, total_rows = self.open_url_source(input_file, url_column)
             
             if start_from > 0:
-                urls = urls[start_from:]
+                urls = islice(urls, start_from, None)
                 self.logger.info(f"Starting from record {start_from}")
             
-            total_urls = len(urls)
-            self.logger.info(f"Found {total_urls} URLs to process")
-            
-            if total_urls == 0:
+            first = next(urls, None)
+            if first is None:
                 self.logger.warning("No URLs found to process")
                 return
+            urls = chain([first], urls)
+            
+            # Row count is an upper bound (blank rows are skipped); unknown for CSV
+            total_urls = max(total_rows - start_from, 0) if total_rows is not None else '?'
+            
+            # Each shard takes every num_shards-th record, so separate processes split the file evenly
+            rows = enumerate(urls, start=start_from + 1)
+            if num_shards > 1:
+                rows = islice(rows, shard, None, num_shards)
+                self.logger.info(f"Shard {shard + 1}/{num_shards}")
+            self.logger.info(f"Streaming up to {total_urls} URLs to process")
             
             self.start_time = time.time()
             
-            # Process URLs
-            for i, url in enumerate(urls, start=start_from + 1):
-                try:
-                    # Log progress
-                    if i % 100 == 0 or i == 1:
-                        stats = self.get_processing_stats()
-                        self.progress_logger.info(
-                            f"Processing {i}/{total_urls} | "
-                            f"Success: {stats['success']} | "
-                            f"Errors: {stats['errors']} | "
-                            f"Rate: {stats['rate_per_minute']:.1f}/min | "
-                            f"URL: {url[:100]}..."
-                        )
-                    
-                    # Detailed summary every 10 records
-                    if i % 10 == 0:
-                        stats = self.get_processing_stats()
-                        self.logger.info(f"📊 SUMMARY: Processed {i}/{total_urls} | Venues: {stats['venues']} | Coaches: {stats['coaches']} | Players: {stats['players']} | Errors: {stats['errors']}")
-                    
-                    # Manual save trigger every 100 records for intermediate downloads
-                    if i % 100 == 0:
-                        self.logger.info(f"💾 MANUAL SAVE at {i} records for intermediate download")
-                        save_result = self.save_progress(f"bookmyplayer_intermediate_{i}")
-                        if save_result:
-                            self.logger.info(f"✅ INTERMEDIATE SAVE SUCCESS: {save_result}")
-                        else:
-                            self.logger.error(f"❌ INTERMEDIATE SAVE FAILED at {i} records")
-                    
-                    # Scrape URL
-                    result = self.scrape_url(url)
-                    self.results.append(result)
-                    self.categorize_result(result)
+            # Pipeline: pool threads fetch up to max_workers pages while this thread
+            # parses completed ones, so counters and lists need no locking.
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                in_flight = {}
+                skipped = 0
+                log_progress = self.progress_logger.info
+                log_info = self.logger.info
+                # Next record index at which each checkpoint fires, so the loop compares instead of dividing
+                next_log = start_from + 1
+                next_summary = (start_from // 10 + 1) * 10
+                next_save = (start_from // 100 + 1) * 100
+                for i, url in rows:
+                    # done doubles as the seen set, so rows repeated in the input are fetched once
+                    if url in self.done:
+                        skipped += 1
+                        continue
+                    self.done.add(url)
+                    try:
+                        # Log progress (stats are only gathered if the record will be emitted)
+                        if i >= next_log:
+                            next_log = (i // 100 + 1) * 100
+                            if self.progress_logger.isEnabledFor(logging.INFO):
+                                stats = self.get_processing_stats()
+                                log_progress(
+                                    "Processing %d/%s | Success: %d | Errors: %d | Rate: %.1f/min | URL: %.100s...",
+                                    i, total_urls, stats['success'], stats['errors'], stats['rate_per_minute'], url
+                                )
+                        
+                        # Detailed summary every 10 records
+                        if i >= next_summary:
+                            next_summary = (i // 10 + 1) * 10
+                            log_info(
+                                "📊 SUMMARY: Processed %d/%s | Venues: %d | Coaches: %d | Players: %d | Errors: %d",
+                                i, total_urls, self.venue_count, self.coach_count, self.player_count, self.error_count
+                            )
+                        
+                        # Flush the NDJSON sinks every 100 records so they can be downloaded mid-run
+                        if i >= next_save:
+                            next_save = (i // 100 + 1) * 100
+                            log_info("💾 MANUAL SAVE at %d records for intermediate download", i)
+                            save_result = self.save_progress(f"bookmyplayer_intermediate_{i}")
+                            if save_result:
+                                log_info("✅ INTERMEDIATE SAVE SUCCESS: %s", save_result)
+                            else:
+                                self.logger.error("❌ INTERMEDIATE SAVE FAILED at %d records", i)
+                        
+                        # Fetch URL in the pool
+                        in_flight[executor.submit(self.fetch_and_parse, url)] = (i, url)
+                        
+                        # Bound the number of queued URLs instead of submitting the whole file
+                        if len(in_flight) >= self.max_workers * 2:
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                self.record_result(future, *in_flight.pop(future))
                     
-                    # Update counters
-                    self.processed_count += 1
-                    if result['type'] in ['venue', 'coach', 'player']:
-                        self.success_count += 1
-                    else:
+                    except Exception as e:
+                        self.logger.error("Error processing URL %s: %s - %s", i, url, e)
                         self.error_count += 1
-                    
-                    # Auto-save check - with detailed logging
-                    if self.processed_count % self.auto_save_interval == 0:
-                        self.logger.info(f"🔄 AUTO-SAVE TRIGGERED at {self.processed_count} records")
-                        save_result = self.save_progress()
-                        if save_result:
-                            self.logger.info(f"✅ AUTO-SAVE SUCCESS: {save_result}")
-                        else:
-                            self.logger.error(f"❌ AUTO-SAVE FAILED at {self.processed_count} records")
-                    
-                    # Delay between requests
-                    if i < total_urls:  # Don't delay after last URL
-                        time.sleep(self.delay_between_requests)
+                        self.processed_count += 1
+                        continue
                 
-                except Exception as e:
-                    self.logger.error(f"Error processing URL {i}: {url} - {e}")
-                    self.error_count += 1
-                    self.processed_count += 1
-                    continue
+                # Drain the remaining in-flight URLs
+                for future in as_completed(list(in_flight)):
+                    self.record_result(future, *in_flight.pop(future))
+                self.flush_batch()
+            
+            if skipped:
+                self.logger.info(f"⏭️ Skipped {skipped} URLs already listed in {self.output_dir}/done.txt or repeated in the input")
             
             # Final save
-            final_file = self.save_progress("bookmyplayer_final")
+            final_file = self.save_progress("bookmyplayer_final", export=True)
             
             # Final stats
             final_stats = self.get_processing_stats()
@@ -917,7 +1487,7 @@ class BookMyPlayerScraperPro:
             
         except Exception as e:
             self.logger.error(f"Error processing Excel file: {e}")
-            self.save_progress("bookmyplayer_error_recovery")
+            self.save_progress("bookmyplayer_error_recovery", export=True)
             raise
 
 if __name__ == "__main__":
@@ -927,12 +1497,22 @@ if __name__ == "__main__":
     INPUT_FILE = os.getenv('INPUT_FILE', 'BookMyPlayer.xlsx')
     URL_COLUMN = os.getenv('URL_COLUMN', '0')
     START_FROM = int(os.getenv('START_FROM', '0'))
+    MAX_WORKERS = int(os.getenv('MAX_WORKERS', '16'))
+    MAX_PER_HOST = int(os.getenv('MAX_PER_HOST', str(MAX_WORKERS)))
+    # Run NUM_SHARDS processes with SHARD=0..NUM_SHARDS-1 to spread parsing over several cores
+    NUM_SHARDS = int(os.getenv('NUM_SHARDS', '1'))
+    SHARD = int(os.getenv('SHARD', '0'))
     
-    # Create scraper
+    # Create scraper; shards keep separate sinks and done.txt so each resumes independently.
+    # Every shard paces the host on its own, so each one waits NUM_SHARDS times REQUEST_DELAY to
+    # keep the combined request rate at one per REQUEST_DELAY
     scraper = BookMyPlayerScraperPro(
         auto_save_interval=AUTO_SAVE_INTERVAL,
-        delay_between_requests=REQUEST_DELAY
+        max_workers=MAX_WORKERS,
+        delay_between_requests=REQUEST_DELAY * NUM_SHARDS,
+        max_per_host=MAX_PER_HOST,
+        output_dir=f'output/shard_{SHARD}' if NUM_SHARDS > 1 else 'output'
     )
     
     # Process URLs
-    scraper.process_urls_from_excel(INPUT_FILE, URL_COLUMN, START_FROM)
+    scraper.process_urls_from_excel(INPUT_FILE, URL_COLUMN, START_FROM, SHARD, NUM_SHARDS)
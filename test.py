@@ -1,23 +1,116 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+import os
+from datetime import timedelta
 from bs4 import BeautifulSoup
 from typing import Dict, Any
+import threading
 import time
-import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# Patterns are compiled once at import instead of going through re's cache on every page
+_PHONE_DIGITS_RE = re.compile(r'[^0-9]')
+_INSTAGRAM_RE = re.compile(r'<a href="(https://www\.instagram\.com/[^"]+)"')
+_DOB_RE = re.compile(r'Date Of Birth:\s*(\d{4}-\d{2}-\d{2})')
+# Location and email icons in one alternation, so a single scan finds both fields
+_COACH_ICONS_RE = re.compile(r'<i class="fa-(?:solid fa-(location)-dot|regular fa-(envelope))"></i>([^<]+)')
+_PLAYER_ICONS_RE = re.compile(r'<i class="fa-(?:solid fa-(location)-dot|regular fa-(envelope))"></i>([^<]*)</p>')
+
+# Element ids that identify a page type when the URL gives no hint
+_VENUE_INDICATORS = frozenset({'academy_phone', 'academy_address', 'listing_title'})
+_COACH_INDICATORS = frozenset({'coachName', 'coachPhone', 'coachAddress'})
+_PLAYER_INDICATORS = frozenset({'playerName', 'playerPhone', 'playerAddress'})
+# Attribute name is case-insensitive and the value may be unquoted, as in an HTML parser; the id
+# value itself stays case-sensitive
+_INDICATOR_ID_RE = re.compile(r'''(?<![\w-])(?i:id)\s*=\s*(["']?)(%s)\1(?![\w-])''' % '|'.join(
+    _VENUE_INDICATORS | _COACH_INDICATORS | _PLAYER_INDICATORS))
+
+# (element id, output key, is a phone number) per page type, in output column order
+_VENUE_FIELDS = (
+    ('academy_phone', 'phone', True),
+    ('academy_address', 'address', False),
+    ('listing_title', 'name', False),
+    ('loc_id_details', 'location_id', False),
+    ('sport_details', 'sport', False),
+    ('object_type_details', 'object_type', False),
+    ('academy_phone2', 'phone2', True),
+)
+_COACH_FIELDS = (
+    ('coachName', 'name', False),
+    ('coachPhone', 'phone', True),
+    ('coachAddress', 'address', False),
+    ('sport_details', 'sport', False),
+)
+_PLAYER_FIELDS = (
+    ('playerAddress', 'address', False),
+    ('playerPhone', 'phone', True),
+    ('playerName', 'name', False),
+    ('loc_id_details', 'location_id', False),
+    ('object_id_details', 'object_id', False),
+)
+
+# Result type -> sheet, in sheet order
+_SHEET_FOR_TYPE = {'venue': 'Venues', 'coach': 'Coaches', 'player': 'Players', 'error': 'Errors', 'unknown': 'Errors'}
+
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
 
 class BookMyPlayerScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    # One Session per process, so every scraper instance reuses the same warm connections
+    _session = None
+    _session_lock = threading.Lock()
+    
+    @classmethod
+    def shared_session(cls) -> requests.Session:
+        """Create the process-wide Session on first use"""
+        with cls._session_lock:
+            if cls._session is None:
+                cache_path = os.getenv('HTTP_CACHE')
+                if cache_path:
+                    # Optional on-disk cache for repeated test runs (pip install requests-cache);
+                    # honours Cache-Control/ETag and serves stale pages if the site errors
+                    from requests_cache import CachedSession
+                    session = CachedSession(cache_path, expire_after=timedelta(days=7),
+                                            stale_if_error=True, cache_control=True)
+                else:
+                    session = requests.Session()
+                # Pool large enough that every worker thread keeps its keep-alive connection
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                                      max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]))
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(_HEADERS)
+                cls._session = session
+            return cls._session
+    
+    def __init__(self, min_interval: float = 1.0):
+        self.session = self.shared_session()
+        # At most two requests in flight per host, however many worker threads there are
+        self.host_slots = defaultdict(lambda: threading.Semaphore(2))
+        self.host_slots_lock = threading.Lock()
+        # Requests to one host also start at least min_interval seconds apart
+        self.min_interval = min_interval
+        self.host_next_start = {}
     
     def fetch_page(self, url: str) -> str:
         """Fetch page content with error handling"""
         try:
             response = self.session.get(url, timeout=20)
             response.raise_for_status()
-            return response.text
+            # The site serves UTF-8; decoding directly skips requests' charset guessing
+            return response.content.decode('utf-8', errors='replace')
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return ""
@@ -27,38 +120,37 @@ class BookMyPlayerScraper:
         if not phone_str:
             return ""
         # Extract digits only
-        digits = re.sub(r'[^0-9]', '', str(phone_str))
+        digits = _PHONE_DIGITS_RE.sub('', str(phone_str))
         if len(digits) == 10:
             return digits
         elif len(digits) > 10:
             return digits[-10:]  # Take last 10 digits
         return phone_str
     
+    def index_ids(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Map each id to its first element in one walk, instead of one soup.find walk per field"""
+        ids = {}
+        for element in soup.find_all(id=True):
+            ids.setdefault(element['id'], element)
+        return ids
+    
+    def extract_id_fields(self, soup: BeautifulSoup, fields: tuple, data: Dict[str, Any]):
+        """Copy each (id, key, is_phone) field that has a value into data"""
+        ids = self.index_ids(soup)
+        for field_id, key, is_phone in fields:
+            element = ids.get(field_id)
+            if element:
+                value = element.get('value') or element.get_text(strip=True)
+                if value:
+                    data[key] = self.format_phone(value) if is_phone else value
+    
     def extract_venue_fields(self, html: str, url: str) -> Dict[str, Any]:
         """Extract venue/academy specific fields"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         data = {'type': 'venue', 'url': url}
         
         # Direct ID extractions
-        id_fields = {
-            'academy_phone': 'phone',
-            'academy_address': 'address', 
-            'listing_title': 'name',
-            'loc_id_details': 'location_id',
-            'sport_details': 'sport',
-            'object_type_details': 'object_type',
-            'academy_phone2': 'phone2'
-        }
-        
-        for field_id, key in id_fields.items():
-            element = soup.find(attrs={'id': field_id})
-            if element:
-                value = element.get('value') or element.get_text(strip=True)
-                if value:
-                    if 'phone' in key:
-                        data[key] = self.format_phone(value)
-                    else:
-                        data[key] = value
+        self.extract_id_fields(soup, _VENUE_FIELDS, data)
         
         # Description from meta tag
         desc_meta = soup.find('meta', attrs={'name': 'description'})
@@ -66,8 +158,7 @@ class BookMyPlayerScraper:
             data['description'] = desc_meta.get('content', '')
         
         # Instagram URL extraction
-        instagram_pattern = r'<a href="(https://www\.instagram\.com/[^"]+)"'
-        instagram_match = re.search(instagram_pattern, html)
+        instagram_match = _INSTAGRAM_RE.search(html)
         if instagram_match:
             data['instagram_url'] = instagram_match.group(1)
         
@@ -75,42 +166,29 @@ class BookMyPlayerScraper:
     
     def extract_coach_fields(self, html: str, url: str) -> Dict[str, Any]:
         """Extract coach specific fields"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         data = {'type': 'coach', 'url': url}
         
         # Direct ID extractions
-        id_fields = {
-            'coachName': 'name',
-            'coachPhone': 'phone',
-            'coachAddress': 'address',
-            'sport_details': 'sport'
-        }
-        
-        for field_id, key in id_fields.items():
-            element = soup.find(attrs={'id': field_id})
-            if element:
-                value = element.get('value') or element.get_text(strip=True)
-                if value:
-                    if key == 'phone':
-                        data[key] = self.format_phone(value)
-                    else:
-                        data[key] = value
-        
-        # Location extraction with icon
-        location_pattern = r'<i class="fa-solid fa-location-dot"></i>\s*([^<]+)'
-        location_match = re.search(location_pattern, html)
-        if location_match:
-            data['location'] = location_match.group(1).strip()
+        self.extract_id_fields(soup, _COACH_FIELDS, data)
         
-        # Email extraction
-        email_pattern = r'<i class="fa-regular fa-envelope"></i>\s*([^<]+@[^<]+)'
-        email_match = re.search(email_pattern, html)
-        if email_match:
-            data['email'] = email_match.group(1).strip()
+        # Location and email extraction with icons, first match of each
+        location = email = None
+        for m in _COACH_ICONS_RE.finditer(html):
+            is_location, is_email, text = m.groups()
+            if is_location and location is None:
+                location = text.strip()
+            elif is_email and email is None and '@' in text[1:-1]:  # something on both sides of the @
+                email = text.strip()
+            if location is not None and email is not None:
+                break
+        if location is not None:
+            data['location'] = location
+        if email is not None:
+            data['email'] = email
         
         # Date of Birth extraction
-        dob_pattern = r'Date Of Birth:\s*(\d{4}-\d{2}-\d{2})'
-        dob_match = re.search(dob_pattern, html)
+        dob_match = _DOB_RE.search(html)
         if dob_match:
             data['date_of_birth'] = dob_match.group(1)
         
@@ -118,40 +196,26 @@ class BookMyPlayerScraper:
     
     def extract_player_fields(self, html: str, url: str) -> Dict[str, Any]:
         """Extract player specific fields"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         data = {'type': 'player', 'url': url}
         
         # Direct ID extractions
-        id_fields = {
-            'playerAddress': 'address',
-            'playerPhone': 'phone',
-            'playerName': 'name',
-            'loc_id_details': 'location_id',
-            'object_id_details': 'object_id'
-        }
+        self.extract_id_fields(soup, _PLAYER_FIELDS, data)
         
-        for field_id, key in id_fields.items():
-            element = soup.find(attrs={'id': field_id})
-            if element:
-                value = element.get('value') or element.get_text(strip=True)
-                if value:
-                    if key == 'phone':
-                        data[key] = self.format_phone(value)
-                    else:
-                        data[key] = value
-        
-        # Location extraction with icon
-        location_pattern = r'<i class="fa-solid fa-location-dot"></i>\s*([^<]+?)</p>'
-        location_match = re.search(location_pattern, html)
-        if location_match:
-            data['location'] = location_match.group(1).strip()
-        
-        # Email extraction
-        email_pattern = r'<i class="fa-regular fa-envelope"></i>\s*([^<]*)</p>'
-        email_match = re.search(email_pattern, html)
-        if email_match:
-            email_value = email_match.group(1).strip()
-            data['email'] = email_value if email_value != '-' else ''
+        # Location and email extraction with icons, first match of each
+        location = email = None
+        for m in _PLAYER_ICONS_RE.finditer(html):
+            is_location, is_email, text = m.groups()
+            if is_location and location is None and text:  # location needs some text, email may be empty
+                location = text.strip()
+            elif is_email and email is None:
+                email = text.strip()
+            if location is not None and email is not None:
+                break
+        if location is not None:
+            data['location'] = location
+        if email is not None:
+            data['email'] = email if email != '-' else ''
         
         return data
     
@@ -166,34 +230,19 @@ class BookMyPlayerScraper:
         elif 'player' in url:
             return 'player'
         
-        # Content-based detection as fallback
-        soup = BeautifulSoup(html, 'html.parser')
+        # Content-based detection as fallback: one scan of the raw HTML collects every indicator id
+        ids_seen = {m.group(2) for m in _INDICATOR_ID_RE.finditer(html)}
         
         # Check for venue-specific elements
-        venue_indicators = [
-            soup.find(attrs={'id': 'academy_phone'}),
-            soup.find(attrs={'id': 'academy_address'}),
-            soup.find(attrs={'id': 'listing_title'})
-        ]
-        if any(venue_indicators):
+        if ids_seen & _VENUE_INDICATORS:
             return 'venue'
         
         # Check for coach-specific elements
-        coach_indicators = [
-            soup.find(attrs={'id': 'coachName'}),
-            soup.find(attrs={'id': 'coachPhone'}),
-            soup.find(attrs={'id': 'coachAddress'})
-        ]
-        if any(coach_indicators):
+        if ids_seen & _COACH_INDICATORS:
             return 'coach'
         
         # Check for player-specific elements
-        player_indicators = [
-            soup.find(attrs={'id': 'playerName'}),
-            soup.find(attrs={'id': 'playerPhone'}),
-            soup.find(attrs={'id': 'playerAddress'})
-        ]
-        if any(player_indicators):
+        if ids_seen & _PLAYER_INDICATORS:
             return 'player'
         
         return 'unknown'
@@ -209,6 +258,7 @@ class BookMyPlayerScraper:
         content_type = self.detect_content_type(html, url)
         print(f"Detected type: {content_type}")
         
+        # Only pages with a known type are parsed, once, inside the chosen extractor
         if content_type == 'venue':
             return self.extract_venue_fields(html, url)
         elif content_type == 'coach':
@@ -218,43 +268,65 @@ class BookMyPlayerScraper:
         else:
             return {'url': url, 'type': 'unknown', 'error': 'Could not determine content type'}
     
-    def scrape_multiple_urls(self, urls: list) -> list:
-        """Scrape multiple URLs and return results"""
-        results = []
-        for i, url in enumerate(urls, 1):
-            print(f"\n[{i}/{len(urls)}] Processing: {url}")
+    def scrape_one(self, i: int, total: int, url: str) -> Dict[str, Any]:
+        """Scrape a single URL while holding one of its host's slots, spaced from the host's last request"""
+        host = urlparse(url).netloc
+        with self.host_slots_lock:
+            slot = self.host_slots[host]
+        with slot:
+            # Be respectful with requests: book the next start time for this host, then wait for it
+            with self.host_slots_lock:
+                now = time.monotonic()
+                start = max(now, self.host_next_start.get(host, now))
+                self.host_next_start[host] = start + self.min_interval
+            time.sleep(start - now)
+            print(f"\n[{i}/{total}] Processing: {url}")
             try:
                 result = self.scrape_url(url)
-                results.append(result)
                 print(f"✓ Success: {result.get('type', 'unknown')} - {result.get('name', 'N/A')}")
-                time.sleep(1)  # Be respectful with requests
+                return result
             except Exception as e:
                 print(f"✗ Error: {e}")
-                results.append({'url': url, 'type': 'error', 'error': str(e)})
-        return results
+                return {'url': url, 'type': 'error', 'error': str(e)}
+    
+    def scrape_multiple_urls(self, urls: list, max_workers: int = 20) -> list:
+        """Scrape multiple URLs concurrently and return results in input order"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.scrape_one, range(1, len(urls) + 1), [len(urls)] * len(urls), urls))
+    
+    def header_cell(self, ws, value: str) -> WriteOnlyCell:
+        """Header cell styled like the pandas/openpyxl export (bold, bordered, centred)"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = _HEADER_FONT
+        cell.border = _HEADER_BORDER
+        cell.alignment = _HEADER_ALIGNMENT
+        return cell
     
     def save_to_excel(self, results: list, filename: str = "scraped_data.xlsx"):
         """Save results to Excel with separate sheets for each type"""
-        venue_data = [r for r in results if r.get('type') == 'venue']
-        coach_data = [r for r in results if r.get('type') == 'coach']
-        player_data = [r for r in results if r.get('type') == 'player']
-        error_data = [r for r in results if r.get('type') in ['error', 'unknown']]
+        # One pass partitions the results into their sheets
+        sheets = {sheet_name: [] for sheet_name in _SHEET_FOR_TYPE.values()}
+        for r in results:
+            sheet_name = _SHEET_FOR_TYPE.get(r.get('type'))
+            if sheet_name:
+                sheets[sheet_name].append(r)
         
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            if venue_data:
-                pd.DataFrame(venue_data).to_excel(writer, sheet_name='Venues', index=False)
-            if coach_data:
-                pd.DataFrame(coach_data).to_excel(writer, sheet_name='Coaches', index=False)
-            if player_data:
-                pd.DataFrame(player_data).to_excel(writer, sheet_name='Players', index=False)
-            if error_data:
-                pd.DataFrame(error_data).to_excel(writer, sheet_name='Errors', index=False)
+        # Write-only workbook streams rows to disk; no DataFrame is built per sheet
+        wb = Workbook(write_only=True)
+        for sheet_name, data in sheets.items():
+            if not data:
+                continue
+            ws = wb.create_sheet(sheet_name)
+            # Columns in first-seen order, as pandas would lay them out
+            keys = list(dict.fromkeys(k for r in data for k in r))
+            ws.append([self.header_cell(ws, k) for k in keys])
+            for r in data:
+                ws.append([r.get(k) for k in keys])
+        wb.save(filename)
         
         print(f"\n✓ Data saved to {filename}")
-        print(f"  - Venues: {len(venue_data)}")
-        print(f"  - Coaches: {len(coach_data)}")
-        print(f"  - Players: {len(player_data)}")
-        print(f"  - Errors: {len(error_data)}")
+        for sheet_name, data in sheets.items():
+            print(f"  - {sheet_name}: {len(data)}")
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,338 @@
+import copy
+import dataclasses
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import openpyxl
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper as scraper_module  # noqa: E402
+from config import ScraperConfig  # noqa: E402
+from scraper import BookMyPlayerScraperPro  # noqa: E402
+
+VENUE_PAGE = '''<html><head><meta name="description" content="Cricket and football training in Noida"></head>
+<body><h2 id="listing_title">Noida Sports Academy</h2>
+<input type="hidden" id="academy_phone" value="+91 98765-43210">
+<input type="hidden" id="sport_details" value="cricket">
+<div id="academy_address" data-label="Location">Sector 5, Noida</div>
+</body></html>'''
+
+PLAYER_PAGE = '''<html><body><h1>Dilnawaz Arshad</h1>
+<input id="playerPhone" value="09876543210">
+<p><i class="fa-solid fa-location-dot"></i> Delhi, Delhi</p>
+</body></html>'''
+
+
+class ScraperTestCase(unittest.TestCase):
+    """Runs the scraper in a scratch directory so output/ and logs/ stay out of the tree"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._cwd = os.getcwd()
+        cls._tmp = tempfile.mkdtemp()
+        os.chdir(cls._tmp)
+        cls.scraper = BookMyPlayerScraperPro()
+
+    @classmethod
+    def tearDownClass(cls):
+        for sink in cls.scraper.sinks.values():
+            sink.close()
+        cls.scraper.done_file.close()
+        os.chdir(cls._cwd)
+        shutil.rmtree(cls._tmp, ignore_errors=True)
+
+
+class UrlClassificationTest(ScraperTestCase):
+    def test_host_name_does_not_classify(self):
+        # bookmyplayer.com contains "player"; only the path may decide the type
+        url = 'https://www.bookmyplayer.com/sports-training-in-noida-locid-4139'
+        self.assertEqual(self.scraper._fallback_url_detection(url), 'unknown')
+        self.assertEqual(self.scraper._profile_id_type(url), 'unknown')
+
+    def test_fallback_rules_use_path(self):
+        cases = {
+            'https://www.bookmyplayer.com/cricket-coaches-in-delhi': 'coach',
+            'https://www.bookmyplayer.com/gym/new-ajinkyatara-fitness-santacruz-west-mumbai-aid-41388': 'venue',
+            'https://www.bookmyplayer.com/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586': 'player',
+            'https://www.bookmyplayer.com/random': 'unknown',
+        }
+        for url, content_type in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.scraper._fallback_url_detection(url), content_type)
+
+    def test_profile_ids(self):
+        cases = {
+            'https://www.bookmyplayer.com/gym/new-ajinkyatara-fitness-santacruz-west-mumbai-aid-41388': 'venue',
+            'https://www.bookmyplayer.com/maheshmhaske-arts-coach-in-shaktinagarjammu-jammuandkashmir-chid-660': 'coach',
+            'https://www.bookmyplayer.com/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586': 'player',
+        }
+        for url, content_type in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.scraper._profile_id_type(url), content_type)
+
+    def test_unmarked_url_is_scored(self):
+        url = 'https://www.bookmyplayer.com/sports-training-in-noida-locid-4139'
+        result = self.scraper.parse_page(VENUE_PAGE.encode(), url)
+        self.assertEqual(result['type'], 'venue')
+        self.assertEqual(result['name'], 'Noida Sports Academy')
+        self.assertEqual(result['address'], 'Sector 5, Noida')
+        self.assertEqual(result['sport'], 'cricket')
+
+    def test_profile_id_url_is_extracted_directly(self):
+        url = 'https://www.bookmyplayer.com/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586'
+        result = self.scraper.parse_page(PLAYER_PAGE.encode(), url)
+        self.assertEqual(result['type'], 'player')
+        self.assertEqual(result['location'], 'Delhi, Delhi')
+
+
+class ListingPageTest(ScraperTestCase):
+    def test_listing_url_with_profile_id_is_not_extracted(self):
+        url = 'https://www.bookmyplayer.com/cricket-players-in-delhi-pid-2586'
+        result = self.scraper.parse_page(PLAYER_PAGE.encode(), url)
+        self.assertNotEqual(result['type'], 'player')
+
+    def test_listing_markup_is_not_extracted(self):
+        url = 'https://www.bookmyplayer.com/random'
+        html = b'<html><body><div class="card">a</div><div class="card">b</div><ul class="pagination"><li>1</li></ul></body></html>'
+        result = self.scraper.parse_page(html, url)
+        self.assertNotIn(result['type'], ('venue', 'coach', 'player'))
+
+
+class LabelledFieldTest(ScraperTestCase):
+    MIXED_LABELS = '<html><body><h1>Ravi Kumar</h1><input id="coachName" value="Ravi Kumar"><p>Address: 12 MG Road, Delhi Location: Delhi NCR</p></body></html>'
+
+    def test_location_label_outranks_address_on_mixed_line(self):
+        url = 'https://www.bookmyplayer.com/ravi-kumar-cricket-coach-in-delhi-chid-1'
+        self.assertEqual(self.scraper.extract_coach_fields(self.MIXED_LABELS, url)['location'], 'Delhi NCR')
+        url = 'https://www.bookmyplayer.com/ravi-kumar-cricket-player-in-delhi-pid-1'
+        self.assertEqual(self.scraper.extract_player_fields(self.MIXED_LABELS, url)['location'], 'Delhi NCR')
+
+
+class CheckpointTest(ScraperTestCase):
+    def _run(self, output_dir, results):
+        scraper = BookMyPlayerScraperPro(output_dir=output_dir)
+        try:
+            scraper._pending.extend(results)
+            scraper.save_progress()
+        finally:
+            for sink in scraper.sinks.values():
+                sink.close()
+            scraper.done_file.close()
+
+    def _lines(self, path):
+        with open(path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_fetch_failures_are_not_repeated_across_runs(self):
+        output_dir = os.path.join(self._tmp, 'rerun')
+        url = 'https://www.bookmyplayer.com/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586'
+        for _ in range(2):
+            self._run(output_dir, [self.scraper.parse_page(b'', url)])
+        errors = self._lines(os.path.join(output_dir, 'errors.ndjson')) + self._lines(os.path.join(output_dir, 'failed.ndjson'))
+        self.assertEqual(len(errors), 1)
+        self.assertNotIn(url, self._lines(os.path.join(output_dir, 'done.txt')))
+
+        # A later successful run leaves no error behind for the URL
+        self._run(output_dir, [self.scraper.parse_page(PLAYER_PAGE.encode(), url)])
+        self.assertEqual(self._lines(os.path.join(output_dir, 'failed.ndjson')), [])
+        self.assertEqual(self._lines(os.path.join(output_dir, 'done.txt')), [url])
+
+    def test_skipped_pages_are_marked_done(self):
+        output_dir = os.path.join(self._tmp, 'skipped')
+        url = 'https://www.bookmyplayer.com/brochure-aid-1'
+        self._run(output_dir, [self.scraper.skipped_result(url, 'unexpected content type application/pdf')])
+        self.assertEqual(self._lines(os.path.join(output_dir, 'done.txt')), [url])
+        self.assertEqual(len(self._lines(os.path.join(output_dir, 'errors.ndjson'))), 1)
+
+    def test_permanent_errors_are_marked_done(self):
+        output_dir = os.path.join(self._tmp, 'gone')
+        url = 'https://www.bookmyplayer.com/missing-pid-9'
+        self._run(output_dir, [self.scraper.permanent_error_result(url, 'HTTP 404 Not Found')])
+        self.assertEqual(self._lines(os.path.join(output_dir, 'done.txt')), [url])
+        self.assertEqual(len(self._lines(os.path.join(output_dir, 'errors.ndjson'))), 1)
+
+
+class FakeResponse:
+    def __init__(self, body, headers, status_code=200, reason='OK'):
+        self.body = body
+        self.headers = headers
+        self.status_code = status_code
+        self.reason = reason
+        self.ok = status_code < 400
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f'{self.status_code} {self.reason}')
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class SkippedPageTest(ScraperTestCase):
+    URL = 'https://www.bookmyplayer.com/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586'
+
+    def _scrape(self, response):
+        with mock.patch.object(self.scraper.session, 'get', return_value=response):
+            return self.scraper.scrape_url(self.URL)
+
+    def test_unexpected_content_type_is_skipped(self):
+        result = self._scrape(FakeResponse(b'%PDF-1.4', {'Content-Type': 'application/pdf'}))
+        self.assertEqual(result['type'], 'skipped')
+        self.assertIn('application/pdf', result['reason'])
+
+    def test_size_cap_applies_without_content_length(self):
+        with mock.patch.object(scraper_module, '_MAX_BODY_BYTES', 1000):
+            result = self._scrape(FakeResponse(b'x' * 100000, {'Content-Type': 'text/html'}))
+        self.assertEqual(result['type'], 'skipped')
+
+    def test_missing_page_is_a_permanent_error(self):
+        result = self._scrape(FakeResponse(b'', {'Content-Type': 'text/html'}, 404, 'Not Found'))
+        self.assertEqual(result['type'], 'error')
+        self.assertEqual(result['error'], 'HTTP 404 Not Found')
+
+    def test_server_error_stays_retryable(self):
+        result = self._scrape(FakeResponse(b'', {'Content-Type': 'text/html'}, 500, 'Internal Server Error'))
+        self.assertEqual(result['error'], scraper_module._FETCH_FAILED)
+
+    def test_page_within_cap_is_parsed(self):
+        result = self._scrape(FakeResponse(PLAYER_PAGE.encode(), {'Content-Type': 'text/html'}))
+        self.assertEqual(result['type'], 'player')
+
+
+class HostThrottleTest(unittest.TestCase):
+    def test_idle_host_allows_only_a_small_burst(self):
+        throttle = scraper_module.HostThrottle(base_delay=1.0, max_concurrent=16)
+        waits = [throttle.time_until_next() for _ in range(16)]
+        self.assertEqual(sum(1 for wait in waits if wait < 1.0), 2)
+        self.assertGreaterEqual(waits[-1], 13.0)
+
+
+class RateLimitedHandler(BaseHTTPRequestHandler):
+    """Answers 429 to the first request for a path, then serves the player page"""
+    seen = set()
+
+    def do_GET(self):
+        if self.path not in self.seen:
+            self.seen.add(self.path)
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = PLAYER_PAGE.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RateLimitTest(ScraperTestCase):
+    def test_throttle_hears_about_retried_rate_limits(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), RateLimitedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = 'http://127.0.0.1:%d/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586' % server.server_port
+            result = self.scraper.scrape_url(url)
+        finally:
+            server.shutdown()
+            server.server_close()
+        # urllib3 retried the 429 itself, but the throttle still backed off for it
+        self.assertEqual(result['type'], 'player')
+        self.assertEqual(self.scraper._host(url).rate_limit_count, 1)
+
+
+class UrlSourceTest(ScraperTestCase):
+    URLS = [
+        'https://www.bookmyplayer.com/gym/new-ajinkyatara-fitness-santacruz-west-mumbai-aid-41388',
+        'https://www.bookmyplayer.com/dilnawaz-arshad-cricket-player-in-delhi-delhi-pid-2586',
+    ]
+
+    def _xlsx(self, name, rows):
+        path = os.path.join(self._tmp, name)
+        wb = openpyxl.Workbook()
+        for row in rows:
+            wb.active.append(row)
+        wb.save(path)
+        return path
+
+    def _csv(self, name, lines):
+        path = os.path.join(self._tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def _read(self, path, column):
+        urls, total = self.scraper.open_url_source(path, column)
+        return list(urls), total
+
+    def test_xlsx_with_header(self):
+        path = self._xlsx('header.xlsx', [('id', 'url'), (1, '  ' + self.URLS[0] + ' '), (2, None), (3, self.URLS[1])])
+        self.assertEqual(self._read(path, 'url'), (self.URLS, 3))
+
+    def test_headerless_xlsx_by_position(self):
+        path = self._xlsx('headerless.xlsx', [(url,) for url in self.URLS])
+        self.assertEqual(self._read(path, '0'), (self.URLS, 2))
+
+    def test_xlsx_missing_column(self):
+        path = self._xlsx('missing.xlsx', [('link',), (self.URLS[0],)])
+        with self.assertRaises(ValueError):
+            self.scraper.open_url_source(path, 'url')
+
+    def test_csv_with_header(self):
+        path = self._csv('header.csv', ['id,url', '1,' + self.URLS[0], '2,', '3, ' + self.URLS[1]])
+        self.assertEqual(self._read(path, 'url'), (self.URLS, None))
+
+    def test_headerless_csv_by_position(self):
+        path = self._csv('headerless.csv', self.URLS)
+        self.assertEqual(self._read(path, '0'), (self.URLS, None))
+
+
+class ConfigTest(unittest.TestCase):
+    def test_from_env_overrides(self):
+        config = ScraperConfig.from_env({'MAX_WORKERS': '4', 'REQUEST_DELAY': '0.5', 'OUTPUT_DIR': '/data'})
+        self.assertEqual(config.MAX_WORKERS, 4)
+        self.assertEqual(config.REQUEST_DELAY, 0.5)
+        self.assertEqual(config.OUTPUT_DIR, '/data')
+        # Anything not in the mapping keeps its default, whatever the process environment says
+        self.assertEqual(config.TIMEOUT, 30)
+        self.assertEqual(config.get_dict()['MAX_WORKERS'], 4)
+
+    def test_constructor_reads_the_environment(self):
+        with mock.patch.dict(os.environ, {'MAX_WORKERS': '3', 'LOG_DIR': '/tmp/logs'}):
+            config = ScraperConfig()
+            explicit = ScraperConfig(MAX_WORKERS=5)
+        self.assertEqual(config.MAX_WORKERS, 3)
+        self.assertEqual(config.LOG_DIR, '/tmp/logs')
+        self.assertEqual(explicit.MAX_WORKERS, 5)
+        self.assertEqual(explicit.LOG_DIR, '/tmp/logs')
+
+    def test_config_copies_after_get_dict(self):
+        config = ScraperConfig.from_env({})
+        self.assertEqual(list(config.get_dict())[:2], ['AUTO_SAVE_INTERVAL', 'REQUEST_DELAY'])
+        self.assertEqual(pickle.loads(pickle.dumps(config)), config)
+        self.assertEqual(copy.deepcopy(config), config)
+        self.assertEqual(dataclasses.asdict(config), dict(config.get_dict()))
+
+
+if __name__ == '__main__':
+    unittest.main()